@@ -1,7 +1,13 @@
 """
 This module implements a genetic algorithm to optimize Himmelblau's function.
+The vectorized engine also accepts any Objetivo over an (N, D) population,
+with Rastrigin, Rosenbrock and Ackley as built-in benchmarks.
 """
 
+import json
+import time
+from collections import deque, namedtuple
+
 import numpy as np
 
 
@@ -22,18 +28,110 @@ def himmelblau(x:float, y:float) -> float:
     """
     return (x**2 + y - 11)**2 + (x + y**2 - 7)**2
 
+
+# Funções de benchmark vetorizadas, recebem a população (N, D) e retornam N fitness
+def rastrigin(populacao:np.ndarray) -> np.ndarray:
+    """ Rastrigin, mínimo 0 em x = 0, limites usuais [-5.12, 5.12] """
+    return 10 * populacao.shape[1] + np.sum(populacao**2 - 10 * np.cos(2 * np.pi * populacao), axis=1)
+
+
+def rosenbrock(populacao:np.ndarray) -> np.ndarray:
+    """ Rosenbrock, mínimo 0 em x = 1, limites usuais [-5, 10] """
+    x, proximo = populacao[:, :-1], populacao[:, 1:]
+    return np.sum(100 * (proximo - x**2)**2 + (1 - x)**2, axis=1)
+
+
+def ackley(populacao:np.ndarray) -> np.ndarray:
+    """ Ackley, mínimo 0 em x = 0, limites usuais [-32.768, 32.768] """
+    dimensoes = populacao.shape[1]
+    quadrados = np.sqrt(np.sum(populacao**2, axis=1) / dimensoes)
+    cossenos = np.sum(np.cos(2 * np.pi * populacao), axis=1) / dimensoes
+    return -20 * np.exp(-0.2 * quadrados) - np.exp(cossenos) + 20 + np.e
+
+
+def himmelblau_vetorizada(populacao:np.ndarray) -> np.ndarray:
+    """ Himmelblau sobre a população (N, 2), quatro mínimos 0, limites [-5, 5] """
+    return himmelblau(populacao[:, 0], populacao[:, 1])
+
+
+class Objetivo():
+    """
+    Função objetivo a ser minimizada com os limites de cada dimensão.
+
+    Qualquer função que recebe a população (N, D) e retorna um array com os N
+    fitness pode ser usada, a população inteira é avaliada em uma chamada.
+    """
+    def __init__(self, funcao, limites, dimensoes=None, nome=None):
+        """
+        Parameters:
+            funcao (callable): Recebe um array (N, D) e retorna um array (N,).
+            limites (tuple | np.ndarray): (inferior, superior) para todas as dimensões ou um array (D, 2).
+            dimensoes (int): Número de dimensões, obrigatório quando limites é um único par.
+            nome (str): Nome usado nas mensagens, o nome da função por padrão.
+        """
+        limites = np.asarray(limites, dtype=float)
+        if limites.ndim == 1:
+            if dimensoes is None:
+                raise ValueError("dimensoes é obrigatório quando limites é um único par (inferior, superior)")
+            limites = np.tile(limites, (dimensoes, 1))
+        if limites.ndim != 2 or limites.shape[1] != 2 or (dimensoes is not None and len(limites) != dimensoes):
+            raise ValueError(f"limites deve ter shape ({dimensoes or 'D'}, 2), recebido {limites.shape}")
+        if np.any(limites[:, 0] > limites[:, 1]):
+            raise ValueError("o limite inferior deve ser menor ou igual ao superior")
+
+        self.funcao = funcao
+        self.inferior = limites[:, 0].copy()
+        self.superior = limites[:, 1].copy()
+        self.dimensoes = len(limites)
+        self.nome = nome or getattr(funcao, "__name__", "objetivo")
+
+    def __call__(self, populacao:np.ndarray) -> np.ndarray:
+        return np.asarray(self.funcao(populacao), dtype=float)
+
+    def __repr__(self):
+        return f'<Objetivo(nome={self.nome}, dimensoes={self.dimensoes})>'
+
+
+# limites usuais de cada função de benchmark, (funcao, inferior, superior)
+BENCHMARKS = {
+    "himmelblau": (himmelblau_vetorizada, -5.0, 5.0),
+    "rastrigin": (rastrigin, -5.12, 5.12),
+    "rosenbrock": (rosenbrock, -5.0, 10.0),
+    "ackley": (ackley, -32.768, 32.768),
+}
+
+
+def objetivo_benchmark(nome:str, dimensoes:int = 2) -> Objetivo:
+    """
+    Cria o Objetivo de uma das funções de BENCHMARKS com os seus limites usuais.
+
+    Parameters:
+        nome (str): himmelblau, rastrigin, rosenbrock ou ackley.
+        dimensoes (int): Número de dimensões, himmelblau só aceita 2.
+
+    Returns:
+        Objetivo: A função com os limites em todas as dimensões.
+    """
+    if nome not in BENCHMARKS:
+        raise ValueError(f"benchmark desconhecido {nome}, use um de {sorted(BENCHMARKS)}")
+    if nome == "himmelblau" and dimensoes != 2:
+        raise ValueError("himmelblau é definida apenas para 2 dimensões")
+    funcao, inferior, superior = BENCHMARKS[nome]
+    return Objetivo(funcao, (inferior, superior), dimensoes=dimensoes, nome=nome)
+
 class Individuo():
     """
     Classe que representa um individuo da população
     """
 
-    def __init__(self, chromosome=None, geracao = 0):
+    def __init__(self, chromosome=None, geracao = 0, fitness = None):
         """
         Inicializa um individuo com um cromossomo aleatório e calcula o fitness do individuo.
 
         Parameters:
             chromosome (list): Cromossomo do individuo. Se não fornecido, um aleatório será gerado.
             geracao (int): Número da geração a qual o individuo pertence.
+            fitness (float): Fitness já calculado (ex. por um Objetivo), evita chamar cal_fitness.
 
         Attributes:
             chromosome (list): Cromossomo do individuo.
@@ -47,7 +145,7 @@ class Individuo():
         self.geracao = geracao
 
         self.chromosome = self.init_chromosome() if chromosome == None else chromosome
-        self.fitness = self.cal_fitness()
+        self.fitness = self.cal_fitness() if fitness is None else fitness
 
         self.passo_evolutivo = 1 # o quanto a mutação vai perimitir variar o valor no espaço
         self.probabilidade_sobrevivencia_relativa_geracao = 0
@@ -116,23 +214,173 @@ class Individuo():
 
 
 
+RegistroGeracao = namedtuple("RegistroGeracao", [
+    "geracao", "fitness", "fitness_medio", "fitness_desvio", "diversidade", "avaliacoes",
+    "tempo_selecao", "tempo_reproducao", "tempo_avaliacao", "chromosome",
+])
+RegistroGeracao.__doc__ = """
+Resumo compacto de uma geração, guardado no lugar do Individuo.
+
+fitness e chromosome são do melhor individuo da geração, diversidade é a média
+do desvio padrão de cada gene na população e avaliacoes o número de cal_fitness.
+"""
+
+class ObservadorBufferCircular():
+    """
+    Observador que mantém em memória apenas os últimos registros de geração.
+    """
+    def __init__(self, capacidade=1000):
+        self.registros = deque(maxlen=capacidade)
+
+    def notificar(self, registro):
+        """ guarda o registro da geração """
+        self.registros.append(registro)
+
+class ObservadorJsonLines():
+    """
+    Observador que escreve cada registro de geração como uma linha JSON.
+    """
+    def __init__(self, caminho):
+        self.arquivo = open(caminho, "a", encoding="utf-8")
+
+    def notificar(self, registro):
+        """ escreve o registro da geração """
+        self.arquivo.write(json.dumps(registro._asdict()) + "\n")
+
+    def close(self):
+        self.arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class CriteriosParada():
+    """
+    Critérios para terminar o run_algoritmo antes de numero_geracoes, todos opcionais.
+    verificar recebe o RegistroGeracao de cada geração e retorna o motivo da parada
+    (um de MOTIVOS) ou None para continuar. O fitness é minimizado.
+    """
+    MOTIVOS = ("fitness_alvo", "estagnacao", "avaliacoes", "tempo")
+
+    def __init__(self, geracoes_estagnado=None, fitness_alvo=None, tempo_maximo=None,
+                 avaliacoes_maximas=None, tolerancia=0.0):
+        """
+        Parameters:
+            geracoes_estagnado (int): Gerações seguidas sem melhorar o melhor fitness em mais que tolerancia.
+            fitness_alvo (float): Para quando o melhor fitness chega a este valor ou menos.
+            tempo_maximo (float): Segundos desde o inicio do run_algoritmo.
+            avaliacoes_maximas (int): Total de avaliações do fitness (soma de RegistroGeracao.avaliacoes).
+            tolerancia (float): Melhora minima para zerar a contagem de estagnação.
+        """
+        self.geracoes_estagnado = geracoes_estagnado
+        self.fitness_alvo = fitness_alvo
+        self.tempo_maximo = tempo_maximo
+        self.avaliacoes_maximas = avaliacoes_maximas
+        self.tolerancia = tolerancia
+        self.iniciar()
+
+    def iniciar(self):
+        """ zera os contadores, chamado no inicio de cada execução """
+        self.inicio = time.perf_counter()
+        self.melhor = None
+        self.estagnado = 0 # gerações desde a última melhora
+        self.avaliacoes = 0
+
+    def verificar(self, registro):
+        """ retorna o motivo para parar depois desta geração ou None """
+        self.avaliacoes += registro.avaliacoes
+        if self.melhor is None or registro.fitness < self.melhor - self.tolerancia:
+            self.melhor = registro.fitness
+            self.estagnado = 0
+        else:
+            self.melhor = min(self.melhor, registro.fitness)
+            self.estagnado += 1
+
+        if self.fitness_alvo is not None and self.melhor <= self.fitness_alvo:
+            return "fitness_alvo"
+        if self.geracoes_estagnado is not None and self.estagnado >= self.geracoes_estagnado:
+            return "estagnacao"
+        if self.avaliacoes_maximas is not None and self.avaliacoes >= self.avaliacoes_maximas:
+            return "avaliacoes"
+        if self.tempo_maximo is not None and time.perf_counter() - self.inicio >= self.tempo_maximo:
+            return "tempo"
+        return None
+
+class MutacaoAdaptativa():
+    """
+    Aumenta a taxa de mutação do run_algoritmo quando a população perde diversidade.
+
+    A diversidade é a do RegistroGeracao (média do desvio padrão de cada gene), que
+    depende da escala do objetivo, então o alvo é uma fração da diversidade da
+    primeira geração. Acima do alvo usa a taxa base, abaixo cresce linearmente
+    até taxa_maxima com diversidade zero.
+    """
+    def __init__(self, fracao_alvo=0.1, taxa_maxima=0.5):
+        """
+        Parameters:
+            fracao_alvo (float): Fração da diversidade inicial abaixo da qual a taxa aumenta.
+            taxa_maxima (float): Taxa de mutação com a população sem nenhuma diversidade.
+        """
+        self.fracao_alvo = fracao_alvo
+        self.taxa_maxima = taxa_maxima
+        self.iniciar()
+
+    def iniciar(self):
+        """ esquece a diversidade inicial, chamado no inicio de cada execução """
+        self.diversidade_alvo = None
+
+    def taxa(self, diversidade, taxa_base):
+        """ taxa de mutação para uma população com esta diversidade """
+        if self.diversidade_alvo is None:
+            self.diversidade_alvo = self.fracao_alvo * diversidade
+        if diversidade >= self.diversidade_alvo:
+            return taxa_base
+        return taxa_base + (self.taxa_maxima - taxa_base) * (1 - diversidade / self.diversidade_alvo)
+
+def iniciar_execucao(criterios, mutacao_adaptativa):
+    """ zera o estado dos criterios de parada e da mutação adaptativa no inicio do run_algoritmo """
+    for controle in (criterios, mutacao_adaptativa):
+        if controle is not None:
+            controle.iniciar()
+
+def proxima_geracao(algoritmo, registro, taxa_mutacao, criterios, mutacao_adaptativa):
+    """ ajusta algoritmo.taxa_mutacao para a próxima geração e retorna o motivo para parar ou None """
+    if mutacao_adaptativa is not None:
+        algoritmo.taxa_mutacao = mutacao_adaptativa.taxa(registro.diversidade, taxa_mutacao)
+    return criterios.verificar(registro) if criterios is not None else None
+
+def finalizar_execucao(algoritmo):
+    """ fecha o run_algoritmo: define o motivo_parada e mostra a melhor solução """
+    if algoritmo.motivo_parada is None:
+        algoritmo.motivo_parada = "numero_geracoes"
+    if algoritmo.verbose:
+        print(f"\nMelhor solução -> G: {algoritmo.melhor_solucao.geracao} \\.fitness: {algoritmo.melhor_solucao.fitness:.2f} coordenadas: {algoritmo.melhor_solucao.chromosome}")
+        if algoritmo.motivo_parada != "numero_geracoes":
+            print(f"Parou na geração {algoritmo.geracao}: {algoritmo.motivo_parada}")
+    return algoritmo.motivo_parada
+
 class AlgoritmoGenetico():
     """
     Classe que representa o algoritmo genético
     """
-    def __init__(self, tamanho_populacao):
+    def __init__(self, tamanho_populacao, observadores=None, verbose=True):
         """
         Inicializa o algoritmo genético com uma população de tamanho_populacao.
 
         Parameters:
             tamanho_populacao (int): Tamanho da população.
+            observadores (list): Objetos com notificar(registro), ou funções, chamados a cada geração.
+            verbose (bool): Se imprime uma linha por geração.
 
         Attributes:
             tamanho_populacao (int): Tamanho da população.
             populacao (list): Lista de individuos da população.
             geracao (int): Número da geração atual.
             melhor_solucao (Individuo): Melhor solução encontrada até o momento.
-            lista_solucoes (list): Lista contendo as soluções de cada geração.
+            lista_solucoes (list): Lista de RegistroGeracao com o resumo de cada geração.
+            motivo_parada (str): Por que o último run_algoritmo terminou.
         """
         self.tamanho_populacao = tamanho_populacao
         self.populacao = []
@@ -140,6 +388,13 @@ class AlgoritmoGenetico():
         self.melhor_solucao = 0
         self.lista_solucoes = []
 
+        self.observadores = list(observadores or [])
+        self.verbose = verbose
+        self.taxa_mutacao = None # taxa da última geração, muda com uma MutacaoAdaptativa
+        self.motivo_parada = None # por que o último run_algoritmo terminou
+        self.tempo_selecao = 0.0
+        self.tempo_avaliacao = 0.0
+
     def melhor_individuo(self, individuo):
         """ verifica se o individuo é o melhor da população """
         if self.melhor_solucao.fitness > individuo.fitness:
@@ -199,14 +454,19 @@ class AlgoritmoGenetico():
         i = 0
 
         for _ in range(0, self.tamanho_populacao, 2):
+            inicio = time.perf_counter()
             pai = self.selecionar_individuo()
             mae = self.selecionar_individuo()
+            self.tempo_selecao += time.perf_counter() - inicio
 
             cromossomos_filho1 = pai.reproduction(mae, taxa_mutacao)
             cromossomos_filho2 = mae.reproduction(pai, taxa_mutacao)
 
+            # o fitness é calculado na criação do individuo
+            inicio = time.perf_counter()
             nova_populacao.append(Individuo(chromosome=cromossomos_filho1, geracao=geracao))
             nova_populacao.append(Individuo(chromosome=cromossomos_filho2, geracao=geracao))
+            self.tempo_avaliacao += time.perf_counter() - inicio
 
             i += 2
 
@@ -225,13 +485,238 @@ class AlgoritmoGenetico():
         melhor = self.populacao[0]
         print(f"G:{self.geracao} -> fitness: {melhor.fitness:.2f} coordenadas: {melhor.chromosome}")
 
-    def run_algoritmo(self, taxa_mutacao, numero_geracoes):
-        """ Executa o algoritmo genetico """
+    def registrar_geracao(self, tempo_selecao, tempo_reproducao, tempo_avaliacao):
+        """ guarda o resumo compacto da geração atual e notifica os observadores """
+        fitness = np.array([individuo.fitness for individuo in self.populacao])
+        cromossomos = np.array([individuo.chromosome for individuo in self.populacao])
+        melhor = self.populacao[0]
+        registro = RegistroGeracao(
+            geracao=self.geracao,
+            fitness=float(melhor.fitness),
+            fitness_medio=float(fitness.mean()),
+            fitness_desvio=float(fitness.std()),
+            diversidade=float(cromossomos.std(axis=0).mean()),
+            avaliacoes=len(self.populacao),
+            tempo_selecao=tempo_selecao,
+            tempo_reproducao=tempo_reproducao,
+            tempo_avaliacao=tempo_avaliacao,
+            chromosome=[float(gene) for gene in melhor.chromosome],
+        )
+        self.lista_solucoes.append(registro)
+        for observador in self.observadores:
+            getattr(observador, "notificar", observador)(registro)
+        return registro
+
+    def run_algoritmo(self, taxa_mutacao, numero_geracoes, criterios=None, mutacao_adaptativa=None):
+        """
+        Executa o algoritmo genetico.
+
+        Parameters:
+            taxa_mutacao (float): Taxa de mutação, a base quando há mutacao_adaptativa.
+            numero_geracoes (int): Número máximo de gerações.
+            criterios (CriteriosParada): Termina antes de numero_geracoes.
+            mutacao_adaptativa (MutacaoAdaptativa): Ajusta a taxa pela diversidade da geração anterior.
+
+        Returns:
+            str: Motivo da parada, "numero_geracoes" ou um de CriteriosParada.MOTIVOS, guardado em motivo_parada.
+        """
+        iniciar_execucao(criterios, mutacao_adaptativa)
+        self.taxa_mutacao = taxa_mutacao
+        self.motivo_parada = None
 
         ## Bloco de Gerações
         for geracao in range(numero_geracoes):
-            nova_populacao = self.reproducao_default(taxa_mutacao, geracao)
+            selecao_antes, avaliacao_antes = self.tempo_selecao, self.tempo_avaliacao
+            inicio = time.perf_counter()
+            nova_populacao = self.reproducao_default(self.taxa_mutacao, geracao)
+            reproduzido = time.perf_counter()
             self.atualizar_populacao(nova_populacao = nova_populacao, geracao = geracao)
-            self.lista_solucoes.append(self.populacao[0])
-            self.visualiza_geracao()
-        print(f"\nMelhor solução -> G: {self.melhor_solucao.geracao} \.fitness: {self.melhor_solucao.fitness:.2f} coordenadas: {self.melhor_solucao.chromosome}")
+            atualizado = time.perf_counter()
+
+            tempo_selecao = self.tempo_selecao - selecao_antes
+            tempo_avaliacao_filhos = self.tempo_avaliacao - avaliacao_antes
+            registro = self.registrar_geracao(
+                tempo_selecao = tempo_selecao,
+                tempo_reproducao = (reproduzido - inicio) - tempo_selecao - tempo_avaliacao_filhos,
+                tempo_avaliacao = tempo_avaliacao_filhos + (atualizado - reproduzido),
+            )
+            if self.verbose:
+                self.visualiza_geracao()
+            self.motivo_parada = proxima_geracao(self, registro, taxa_mutacao, criterios, mutacao_adaptativa)
+            if self.motivo_parada is not None:
+                break
+        return finalizar_execucao(self)
+
+
+class AlgoritmoGeneticoVetorizado():
+    """
+    Versão vetorizada do AlgoritmoGenetico para populações grandes (10^6 individuos).
+
+    A população é um array (N, D) ordenado pelo fitness, sem objetos Individuo.
+    Fitness, seleção por roleta, crossover de um ponto, mutação com limite e
+    elitismo são operações sobre o array inteiro, usando um np.random.Generator.
+    Por padrão minimiza a himmelblau em [-limite, limite]^2, outro Objetivo
+    define a função e os limites de cada dimensão.
+    """
+    def __init__(self, tamanho_populacao, elitismo=1, passo_evolutivo=1, limite=5,
+                 semente=None, observadores=None, verbose=True, objetivo=None):
+        """
+        Inicializa o algoritmo genético vetorizado.
+
+        Parameters:
+            tamanho_populacao (int): Tamanho da população.
+            elitismo (int): Quantidade dos melhores individuos copiados para a próxima geração.
+            passo_evolutivo (float): O quanto a mutação vai permitir variar o valor no espaço.
+            limite (float): Os genes ficam no intervalo [-limite, limite], usado quando não há objetivo.
+            semente (int): Semente do gerador de números aleatórios.
+            observadores (list): Objetos com notificar(registro), ou funções, chamados a cada geração.
+            verbose (bool): Se imprime uma linha por geração.
+            objetivo (Objetivo): Função a minimizar e limites, himmelblau em 2 dimensões por padrão.
+
+        Attributes:
+            populacao (np.ndarray): Cromossomos da população, shape (N, D), do melhor para o pior.
+            fitness (np.ndarray): Fitness de cada individuo, shape (N,).
+            melhor_solucao (Individuo): Melhor solução encontrada até o momento.
+            lista_solucoes (list): Lista de RegistroGeracao com o resumo de cada geração.
+        """
+        self.tamanho_populacao = tamanho_populacao
+        self.elitismo = elitismo
+        self.passo_evolutivo = passo_evolutivo
+        self.objetivo = objetivo or Objetivo(himmelblau_vetorizada, (-limite, limite), dimensoes=2, nome="himmelblau")
+        self.rng = np.random.default_rng(semente)
+
+        self.populacao = np.empty((0, self.objetivo.dimensoes))
+        self.fitness = np.empty(0)
+        self.probabilidade_acumulada = np.empty(0)
+        self.geracao = 0
+        self.melhor_solucao = 0
+        self.lista_solucoes = []
+
+        self.observadores = list(observadores or [])
+        self.verbose = verbose
+        self.taxa_mutacao = None
+        self.motivo_parada = None
+
+    def avaliar(self, cromossomos):
+        """ fitness de todos os cromossomos em uma chamada do objetivo """
+        return self.objetivo(cromossomos)
+
+    def ordena_populacao(self):
+        """ ordena a população de acordo com o fitness """
+        ordem = np.argsort(self.fitness, kind="stable")
+        self.populacao = self.populacao[ordem]
+        self.fitness = self.fitness[ordem]
+
+    def avaliar_populacao(self):
+        """
+        calcula a probabilidade acumulada de seleção da população ordenada,
+        como em AlgoritmoGenetico.avaliar_populacao o melhor individuo recebe
+        a fatia do maior fitness (a ordem dos fitness é invertida)
+        """
+        probabilidades = self.fitness[::-1] / self.fitness.sum()
+        self.probabilidade_acumulada = np.cumsum(probabilidades)
+
+    def melhor_individuo(self):
+        """ atualiza a melhor solução com o melhor da população ordenada """
+        if self.melhor_solucao == 0 or self.melhor_solucao.fitness > self.fitness[0]:
+            self.melhor_solucao = Individuo(chromosome=self.populacao[0].tolist(), geracao=self.geracao,
+                                            fitness=float(self.fitness[0]))
+
+    def inicializa_populacao(self):
+        """ inicializa a população com individuos aleatórios """
+        self.populacao = self.rng.uniform(self.objetivo.inferior, self.objetivo.superior,
+                                          size=(self.tamanho_populacao, self.objetivo.dimensoes))
+        self.fitness = self.avaliar(self.populacao)
+        self.ordena_populacao()
+        self.melhor_individuo()
+        self.avaliar_populacao()
+
+    def selecionar_individuos(self, quantidade):
+        """
+        seleciona os indices de quantidade individuos pela roleta, uma busca binária por sorteio;
+        os sorteios são buscados em ordem (acessos sequenciais à probabilidade acumulada,
+        bem mais rápido em populações grandes) e os indices voltam para a ordem dos sorteios
+        """
+        sorteios = self.rng.random(quantidade) * self.probabilidade_acumulada[-1]
+        ordem = np.argsort(sorteios)
+        indices = np.empty(quantidade, dtype=np.intp)
+        indices[ordem] = np.searchsorted(self.probabilidade_acumulada, sorteios[ordem], side="right")
+        return np.minimum(indices, len(self.populacao) - 1)
+
+    def crossover(self, pais, maes):
+        """
+        crossover de um ponto para cada par (pai, mae): o corte fica entre 1 e D-1
+        e a ordem dos pais é sorteada, então o filho começa com os genes de um e
+        termina com os do outro (em 2 dimensões é o Individuo.crossover_default)
+        """
+        quantidade, dimensoes = pais.shape
+        corte = self.rng.integers(1, max(dimensoes, 2), size=(quantidade, 1))
+        inverte = self.rng.random((quantidade, 1)) < 0.5
+        inicio = np.arange(dimensoes) < corte
+        return np.where(inicio != inverte, pais, maes)
+
+    def mutacao(self, cromossomos, taxa_mutacao):
+        """ cada gene sofre mutação com probabilidade taxa_mutacao, limitada aos limites do objetivo """
+        mascara = self.rng.random(cromossomos.shape) < taxa_mutacao
+        passo = self.rng.uniform(-self.passo_evolutivo, self.passo_evolutivo, size=cromossomos.shape)
+        return np.clip(cromossomos + mascara * passo, self.objetivo.inferior, self.objetivo.superior)
+
+    def visualiza_geracao(self):
+        """ Mostra a geração atual """
+        print(f"G:{self.geracao} -> fitness: {self.fitness[0]:.2f} coordenadas: {self.populacao[0].tolist()}")
+
+    def registrar_geracao(self, tempo_selecao, tempo_reproducao, tempo_avaliacao, avaliacoes):
+        """ guarda o resumo compacto da geração atual e notifica os observadores """
+        registro = RegistroGeracao(
+            geracao=self.geracao,
+            fitness=float(self.fitness[0]),
+            fitness_medio=float(self.fitness.mean()),
+            fitness_desvio=float(self.fitness.std()),
+            diversidade=float(self.populacao.std(axis=0).mean()),
+            avaliacoes=avaliacoes,
+            tempo_selecao=tempo_selecao,
+            tempo_reproducao=tempo_reproducao,
+            tempo_avaliacao=tempo_avaliacao,
+            chromosome=self.populacao[0].tolist(),
+        )
+        self.lista_solucoes.append(registro)
+        for observador in self.observadores:
+            getattr(observador, "notificar", observador)(registro)
+        return registro
+
+    def run_algoritmo(self, taxa_mutacao, numero_geracoes, criterios=None, mutacao_adaptativa=None):
+        """ Executa o algoritmo genetico, os parametros e o retorno são os de AlgoritmoGenetico.run_algoritmo """
+        iniciar_execucao(criterios, mutacao_adaptativa)
+        self.taxa_mutacao = taxa_mutacao
+        self.motivo_parada = None
+        if len(self.populacao) == 0:
+            self.inicializa_populacao()
+        quantidade_filhos = self.tamanho_populacao - self.elitismo
+
+        ## Bloco de Gerações
+        for geracao in range(numero_geracoes):
+            inicio = time.perf_counter()
+            pais = self.selecionar_individuos(quantidade_filhos)
+            maes = self.selecionar_individuos(quantidade_filhos)
+            selecionado = time.perf_counter()
+
+            filhos = self.crossover(self.populacao[pais], self.populacao[maes])
+            filhos = self.mutacao(filhos, self.taxa_mutacao)
+            reproduzido = time.perf_counter()
+
+            # a elite (população ordenada) segue sem alteração
+            self.populacao = np.concatenate((self.populacao[:self.elitismo], filhos))
+            self.fitness = np.concatenate((self.fitness[:self.elitismo], self.avaliar(filhos)))
+            self.geracao = geracao
+            self.ordena_populacao()
+            self.melhor_individuo()
+            self.avaliar_populacao()
+            avaliado = time.perf_counter()
+
+            registro = self.registrar_geracao(selecionado - inicio, reproduzido - selecionado, avaliado - reproduzido, quantidade_filhos)
+            if self.verbose:
+                self.visualiza_geracao()
+            self.motivo_parada = proxima_geracao(self, registro, taxa_mutacao, criterios, mutacao_adaptativa)
+            if self.motivo_parada is not None:
+                break
+        return finalizar_execucao(self)
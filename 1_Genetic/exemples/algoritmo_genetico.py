@@ -1,5 +1,8 @@
+from array import array
+import csv
+import os
 from random import random
-import matplotlib.pyplot as plt
+import numpy as np
 
 class Produto():
 
@@ -155,23 +158,305 @@ class AlgoritmoGenetico():
 
         return self.melhor_solucao.cromossomo
 
+def carregar_itens(caminho, coluna_espaco = "espaco", coluna_valor = "valor"):
+    # le o catálogo direto para dois arrays contíguos (espacos, valores), sem criar Produto
+    # .npy: array (n, 2) com espaço e valor ou array estruturado com as duas colunas, aberto com mmap
+    # .csv: lido linha a linha, só as duas colunas são convertidas
+    if os.path.splitext(caminho)[1] == ".npy":
+        itens = np.load(caminho, mmap_mode = "r")
+        if itens.dtype.names:
+            return (np.ascontiguousarray(itens[coluna_espaco], dtype = np.float64),
+                    np.ascontiguousarray(itens[coluna_valor], dtype = np.float64))
+        if itens.ndim != 2 or itens.shape[1] != 2:
+            raise ValueError(f"{caminho}: esperado um array (n, 2) de espaço e valor, recebido {itens.shape}")
+        return (np.ascontiguousarray(itens[:, 0], dtype = np.float64),
+                np.ascontiguousarray(itens[:, 1], dtype = np.float64))
+
+    espacos = array("d")
+    valores = array("d")
+    with open(caminho, newline = "", encoding = "utf-8") as arquivo:
+        leitor = csv.reader(arquivo)
+        cabecalho = next(leitor)
+        try:
+            i_espaco, i_valor = cabecalho.index(coluna_espaco), cabecalho.index(coluna_valor)
+        except ValueError:
+            raise ValueError(f"{caminho}: colunas {coluna_espaco} e {coluna_valor} não encontradas em {cabecalho}") from None
+        for linha in leitor:
+            if linha:
+                espacos.append(float(linha[i_espaco]))
+                valores.append(float(linha[i_valor]))
+    return np.frombuffer(espacos, dtype = np.float64), np.frombuffer(valores, dtype = np.float64)
+
+def solucao_gulosa(espacos, valores, limite_espacos):
+    # adiciona os itens por ordem decrescente de valor / espaço enquanto couberem
+    espacos = np.asarray(espacos, dtype = np.float64)
+    valores = np.asarray(valores, dtype = np.float64)
+    ordem = np.argsort(-valores / np.maximum(espacos, np.finfo(np.float64).tiny), kind = "stable")
+    escolhidos = np.zeros(len(espacos), dtype = bool)
+    restante = limite_espacos
+    for item in ordem:
+        if espacos[item] <= restante:
+            escolhidos[item] = True
+            restante -= espacos[item]
+    return escolhidos
+
+def escala_dp(espacos, limite_espacos, max_celulas = 50_000_000, max_casas = 9):
+    # menor potência de 10 que torna todos os espaços inteiros (até max_casas decimais),
+    # reduzida até a tabela da dp, itens x (capacidade + 1), caber em max_celulas
+    espacos = np.asarray(espacos, dtype = np.float64)
+    casas = 0
+    while casas < max_casas and not np.allclose(espacos * 10**casas, np.round(espacos * 10**casas), rtol = 0, atol = 1e-6):
+        casas += 1
+    while casas > 0 and len(espacos) * (int(np.floor(limite_espacos * 10**casas)) + 1) > max_celulas:
+        casas -= 1
+    return 10**casas
+
+def solucao_dp(espacos, valores, limite_espacos, escala = None, max_celulas = 50_000_000):
+    # mochila 0/1 por programação dinâmica, para capacidades pequenas
+    # os espaços são arredondados para cima em unidades de 1 / escala, então a solução sempre cabe
+    # sem escala usa a resolução dos próprios espaços, limitada por max_celulas (escala_dp)
+    if escala is None:
+        escala = escala_dp(espacos, limite_espacos, max_celulas)
+    espacos_inteiros = np.ceil(np.asarray(espacos, dtype = np.float64) * escala).astype(np.int64)
+    valores = np.asarray(valores, dtype = np.float64)
+    capacidade = int(np.floor(limite_espacos * escala))
+    if len(espacos_inteiros) * (capacidade + 1) > max_celulas:
+        raise ValueError(f"capacidade {capacidade} x {len(espacos_inteiros)} itens excede {max_celulas} células, use solucao_gulosa")
+
+    melhor = np.zeros(capacidade + 1)
+    escolhas = np.zeros((len(espacos_inteiros), capacidade + 1), dtype = bool)
+    for item, (espaco, valor) in enumerate(zip(espacos_inteiros, valores)):
+        if espaco > capacidade:
+            continue
+        com_item = melhor[:capacidade + 1 - espaco] + valor
+        escolhas[item, espaco:] = com_item > melhor[espaco:]
+        melhor[espaco:] = np.maximum(melhor[espaco:], com_item)
+
+    escolhidos = np.zeros(len(espacos_inteiros), dtype = bool)
+    restante = capacidade
+    for item in range(len(espacos_inteiros) - 1, -1, -1):
+        if escolhas[item, restante]:
+            escolhidos[item] = True
+            restante -= espacos_inteiros[item]
+    return escolhidos
+
+class AlgoritmoGeneticoBits():
+    # populacao é uma matriz de bits empacotados (np.packbits), uma linha por individuo:
+    # o item i é o bit 7 - i % 8 do byte i // 8, os bits de sobra do último byte ficam em 0
+    # modos de reparo dos individuos que excedem o limite de espaço:
+    # None aplica a penalidade nota = 1, "lamarckiano" grava o reparo no cromossomo,
+    # "baldwiniano" só usa o reparo para calcular a nota
+    MODOS_REPARO = (None, "lamarckiano", "baldwiniano")
+
+    def __init__(self, tamanho_populacao, semente = None, verbose = True, bits_por_bloco = 1 << 21, reparo = None):
+        if reparo not in self.MODOS_REPARO:
+            raise ValueError(f"reparo desconhecido {reparo}, use um de {self.MODOS_REPARO}")
+        self.tamanho_populacao = tamanho_populacao
+        self.reparo = reparo
+        self.avaliacoes = 0
+        self.avaliacoes_inviaveis = 0 # individuos que excederam o limite, antes do reparo
+        self.rng = np.random.default_rng(semente)
+        self.verbose = verbose
+        self.bits_por_bloco = bits_por_bloco # limita a memória de np.unpackbits na avaliação
+        self.populacao = np.empty((0, 0), dtype = np.uint8)
+        self.notas = np.empty(0)
+        self.espacos_usados = np.empty(0)
+        self.geracao = 0
+        self.melhor_solucao = None
+        self.melhor_nota = 0
+        self.melhor_espaco = 0
+        self.melhor_geracao = 0
+        self.lista_solucoes = []
+
+    def inicializa_populacao(self, espacos, valores, limite_espacos, semeadura = None, fracao_semeada = 0.1,
+                             escala = None, max_celulas = 50_000_000):
+        # coluna 0 espaço, coluna 1 valor, para as duas somas saírem de um produto de matrizes
+        self.itens = np.column_stack((np.asarray(espacos, dtype = np.float64),
+                                      np.asarray(valores, dtype = np.float64)))
+        self.numero_itens = len(self.itens)
+        self.limite_espacos = limite_espacos
+        self.numero_bytes = (self.numero_itens + 7) // 8
+        self.mascara_final = np.uint8((0xFF << (-self.numero_itens % 8)) & 0xFF)
+        # ordem crescente de valor / espaço, os primeiros são os removidos no reparo
+        razao = self.itens[:, 1] / np.maximum(self.itens[:, 0], np.finfo(np.float64).tiny)
+        self.ordem_reparo = np.argsort(razao, kind = "stable")
+        self.itens_reparo = self.itens[self.ordem_reparo]
+        self.populacao = self.rng.integers(0, 256, size = (self.tamanho_populacao, self.numero_bytes), dtype = np.uint8)
+        self.populacao[:, -1] &= self.mascara_final
+        if semeadura is not None:
+            self.semeia_populacao(semeadura, fracao_semeada, escala, max_celulas)
+
+    def semeia_populacao(self, semeadura, fracao_semeada, escala = None, max_celulas = 50_000_000):
+        # troca parte da população pela solução gulosa ou da dp, as cópias depois da primeira
+        # recebem uma mutação de ~1 bit para não começarem idênticas
+        # escala e max_celulas vão para solucao_dp, a escala padrão vem da resolução dos espaços
+        if semeadura == "gulosa":
+            solucao = solucao_gulosa(self.itens[:, 0], self.itens[:, 1], self.limite_espacos)
+        elif semeadura == "dp":
+            solucao = solucao_dp(self.itens[:, 0], self.itens[:, 1], self.limite_espacos, escala, max_celulas)
+        else:
+            raise ValueError(f"semeadura desconhecida {semeadura}, use 'gulosa' ou 'dp'")
+        quantidade = max(1, int(self.tamanho_populacao * fracao_semeada))
+        copias = np.tile(np.packbits(solucao), (quantidade, 1))
+        copias[1:] = self.mutacao(copias[1:], 1 / self.numero_itens)
+        self.populacao[:quantidade] = copias
+
+    def avaliacao(self, populacao):
+        # no modo lamarckiano as linhas reparadas de populacao são sobrescritas
+        somas = np.empty((len(populacao), 2))
+        linhas = max(1, self.bits_por_bloco // max(self.numero_itens, 1))
+        for inicio in range(0, len(populacao), linhas):
+            bloco = slice(inicio, inicio + linhas)
+            bits = np.unpackbits(populacao[bloco], axis = 1, count = self.numero_itens)
+            somas[bloco] = bits @ self.itens
+            inviaveis = np.flatnonzero(somas[bloco, 0] > self.limite_espacos)
+            self.avaliacoes_inviaveis += len(inviaveis)
+            if self.reparo is not None and len(inviaveis):
+                reparados = self.repara(bits[inviaveis], somas[bloco][inviaveis, 0])
+                somas[inicio + inviaveis] = reparados @ self.itens
+                if self.reparo == "lamarckiano":
+                    populacao[inicio + inviaveis] = np.packbits(reparados, axis = 1)
+        self.avaliacoes += len(populacao)
+        espacos_usados, notas = somas[:, 0], somas[:, 1]
+        notas[espacos_usados > self.limite_espacos] = 1 # mesma penalidade do Individuo.avaliacao
+        return notas, espacos_usados
+
+    def repara(self, bits, espacos_usados):
+        # remove os itens de menor valor / espaço até o excesso de espaço ser coberto,
+        # para todas as linhas de uma vez: na ordem de reparo, um item escolhido sai
+        # enquanto a soma dos espaços removidos antes dele ainda não cobre o excesso
+        ordenados = bits[:, self.ordem_reparo]
+        espacos = ordenados * self.itens_reparo[:, 0]
+        removidos_antes = np.cumsum(espacos, axis = 1) - espacos
+        excesso = espacos_usados - self.limite_espacos
+        ordenados &= ~((removidos_antes < excesso[:, None]) & (ordenados == 1))
+        reparados = np.empty_like(bits)
+        reparados[:, self.ordem_reparo] = ordenados
+        return reparados
+
+    def ordena_populacao(self):
+        ordem = np.argsort(-self.notas, kind = "stable")
+        self.populacao = self.populacao[ordem]
+        self.notas = self.notas[ordem]
+        self.espacos_usados = self.espacos_usados[ordem]
+
+    def individuo_reparado(self, individuo):
+        # no modo baldwiniano a nota é a do cromossomo reparado, que não fica na população
+        bits = self.cromossomo(individuo)[None, :]
+        espaco_usado = bits @ self.itens[:, 0]
+        if espaco_usado[0] <= self.limite_espacos:
+            return individuo.copy()
+        return np.packbits(self.repara(bits, espaco_usado)[0])
+
+    def melhor_individuo(self):
+        if self.melhor_solucao is None or self.notas[0] > self.melhor_nota:
+            if self.reparo == "baldwiniano":
+                self.melhor_solucao = self.individuo_reparado(self.populacao[0])
+            else:
+                self.melhor_solucao = self.populacao[0].copy()
+            self.melhor_nota = self.notas[0]
+            self.melhor_espaco = self.espacos_usados[0]
+            self.melhor_geracao = self.geracao
+
+    def seleciona_pais(self, quantidade): # seleção roleta viciada, uma busca binária por sorteio
+        acumulado = np.cumsum(self.notas)
+        sorteios = self.rng.random(quantidade) * acumulado[-1]
+        return np.minimum(np.searchsorted(acumulado, sorteios, side = "right"), len(self.notas) - 1)
+
+    def crossover(self, pais1, pais2):
+        # corte de um ponto como Individuo.crossover: filho1 = pai2[:corte] + pai1[corte:]
+        cortes = np.rint(self.rng.random(len(pais1)) * self.numero_itens).astype(np.int64)
+        posicoes = np.arange(self.numero_bytes) * 8
+        bits_no_byte = np.clip(cortes[:, None] - posicoes, 0, 8)
+        mascara = ((0xFF00 >> bits_no_byte) & 0xFF).astype(np.uint8) # 1 nos bits antes do corte
+        filhos1 = (pais2 & mascara) | (pais1 & ~mascara)
+        filhos2 = (pais1 & mascara) | (pais2 & ~mascara)
+        return np.concatenate((filhos1, filhos2))
+
+    def mutacao(self, populacao, taxa_mutacao):
+        # xor com uma máscara de Bernoulli esparsa: sorteia quantos bits mudam e quais
+        total_bits = len(populacao) * self.numero_itens
+        quantidade = self.rng.binomial(total_bits, taxa_mutacao)
+        bits = self.rng.choice(total_bits, size = quantidade, replace = False)
+        linhas, colunas = np.divmod(bits, self.numero_itens)
+        np.bitwise_xor.at(populacao, (linhas, colunas // 8), (0x80 >> (colunas % 8)).astype(np.uint8))
+        return populacao
+
+    def cromossomo(self, individuo):
+        return np.unpackbits(individuo, count = self.numero_itens)
+
+    def visualiza_geracao(self):
+        print(f"G:{self.geracao} -> Valor: {self.notas[0]:.2f} Espaço: {self.espacos_usados[0]:.2f} Itens: {int(self.cromossomo(self.populacao[0]).sum())}")
+
+    def resolver(
+                self,
+                taxa_mutacao,
+                numero_geracoes,
+                espacos, valores,
+                limite_espacos,
+                semeadura = None,
+                fracao_semeada = 0.1,
+                escala = None,
+                max_celulas = 50_000_000
+            ):
+
+        ## Bloco de inicialização
+        self.inicializa_populacao(espacos, valores, limite_espacos, semeadura, fracao_semeada, escala, max_celulas)
+        self.notas, self.espacos_usados = self.avaliacao(self.populacao)
+        self.ordena_populacao()
+        self.melhor_individuo()
+        self.lista_solucoes.append(float(self.notas[0]))
+        if self.verbose:
+            self.visualiza_geracao()
+
+        ## Bloco de Gerações
+        pares = (self.tamanho_populacao + 1) // 2
+        for geracao in range(numero_geracoes):
+            self.geracao = geracao + 1
+            pais1 = self.populacao[self.seleciona_pais(pares)]
+            pais2 = self.populacao[self.seleciona_pais(pares)]
+
+            filhos = self.crossover(pais1, pais2)[:self.tamanho_populacao]
+            self.populacao = self.mutacao(filhos, taxa_mutacao)
+            self.populacao[:, -1] &= self.mascara_final
+
+            self.notas, self.espacos_usados = self.avaliacao(self.populacao)
+            self.ordena_populacao()
+            if self.verbose:
+                self.visualiza_geracao()
+
+            self.lista_solucoes.append(float(self.notas[0]))
+            self.melhor_individuo()
+
+        if self.verbose:
+            print(f"\nMelhor solução -> G: {self.melhor_geracao} Valor: {self.melhor_nota:.2f} Espaço: {self.melhor_espaco:.2f}")
+            print(f"Avaliações: {self.avaliacoes} Inviáveis: {self.avaliacoes_inviaveis} ({self.avaliacoes_inviaveis / max(self.avaliacoes, 1):.1%})")
+
+        return self.cromossomo(self.melhor_solucao)
+
+PRODUTOS_EXEMPLO = [ # (nome, espaço, valor) do exemplo, limite de espaço LIMITE_EXEMPLO
+    ("Geladeira Dako", 0.751, 999.90),
+    ("Iphone 6", 0.0000899, 2199.12),
+    ("TV 55", 0.400, 4346.99),
+    ("TV 50", 0.290, 3999.90),
+    ("TV 42", 0.200, 2999.00),
+    ("Notebook Dell", 0.00350, 2499.90),
+    ("Ventilador Panasonic", 0.496, 199.90),
+    ("Microondas Electrolux", 0.0424, 308.66),
+    ("Microondas LG", 0.0544, 429.90),
+    ("Microondas Panasonic", 0.0319, 299.29),
+    ("Geladeira Brastemp", 0.635, 849.00),
+    ("Geladeira Consul", 0.870, 1199.89),
+    ("Notebook Lenovo", 0.498, 1999.90),
+    ("Notebook Asus", 0.527, 3999.00),
+]
+LIMITE_EXEMPLO = 3
+
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
     print("bu")
-    lista_produtos = []
-    lista_produtos.append(Produto("Geladeira Dako", 0.751, 999.90))
-    lista_produtos.append(Produto("Iphone 6", 0.0000899, 2199.12))
-    lista_produtos.append(Produto("TV 55", 0.400, 4346.99))
-    lista_produtos.append(Produto("TV 50", 0.290, 3999.90))
-    lista_produtos.append(Produto("TV 42", 0.200, 2999.00))
-    lista_produtos.append(Produto("Notebook Dell", 0.00350, 2499.90))
-    lista_produtos.append(Produto("Ventilador Panasonic", 0.496, 199.90))
-    lista_produtos.append(Produto("Microondas Electrolux", 0.0424, 308.66))
-    lista_produtos.append(Produto("Microondas LG", 0.0544, 429.90))
-    lista_produtos.append(Produto("Microondas Panasonic", 0.0319, 299.29))
-    lista_produtos.append(Produto("Geladeira Brastemp", 0.635, 849.00))
-    lista_produtos.append(Produto("Geladeira Consul", 0.870, 1199.89))
-    lista_produtos.append(Produto("Notebook Lenovo", 0.498, 1999.90))
-    lista_produtos.append(Produto("Notebook Asus", 0.527, 3999.00))
+    lista_produtos = [Produto(nome, espaco, valor) for nome, espaco, valor in PRODUTOS_EXEMPLO]
 
     espacos = []
     valores = []
@@ -182,7 +467,7 @@ if __name__ == "__main__":
         valores.append(produto.valor)
         nomes.append(produto.nome)
 
-    limite = 3
+    limite = LIMITE_EXEMPLO
     tamanho_populacao = 20
     taxa_mutacao = 0.01
     numero_geracoes = 100
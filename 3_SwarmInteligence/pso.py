@@ -0,0 +1,511 @@
+"""
+Vectorized Particle Swarm Optimization.
+
+The same algorithm as the PSO class of Swarm_Intelligence.ipynb, with the
+swarm stored as (N, D) arrays of positions, velocities and personal bests,
+so each iteration is a handful of NumPy operations over the whole swarm.
+
+Besides the global best, the social term can follow a local best over a
+ring, a von Neumann grid or k random informants per particle, given by an (N, k)
+array of neighbor indices, which keeps separate niches in multimodal
+functions (e.g. the four minima of Himmelblau's function).
+
+run_islands runs K swarms in parallel processes that exchange their bests
+through shared memory, and sweep spreads a (w, c1, c2) grid over a process
+pool.
+"""
+
+import itertools
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import connection, shared_memory
+
+import numpy as np
+
+
+def himmelblau(positions:np.ndarray) -> np.ndarray:
+    """Himmelblau's function for every row of an (N, 2) array of positions."""
+    x, y = positions[:, 0], positions[:, 1]
+    return (x**2 + y - 11)**2 + (x + y**2 - 7)**2
+
+
+BOUNDARIES = ("clip", "reflect", "none")
+TOPOLOGIES = ("global", "ring", "von_neumann", "random")
+MIGRATIONS = ("best_to_worst", "random")
+
+
+def bounds_array(bounds, dimensions:int = 2) -> np.ndarray:
+    """(D, 2) array of (low, high) from a single pair repeated over dimensions or a (D, 2) array."""
+    bounds = np.asarray(bounds, dtype=float)
+    if bounds.ndim == 1:
+        bounds = np.tile(bounds, (dimensions, 1))
+    if bounds.ndim != 2 or bounds.shape[1] != 2:
+        raise ValueError(f"bounds must be a (low, high) pair or a (D, 2) array, got {bounds.shape}")
+    return bounds
+
+
+def ring_neighbors(quantity:int, k:int = 2) -> np.ndarray:
+    """(N, k + 1) indices of each particle and its k nearest particles on a ring."""
+    offsets = np.arange(-(k // 2), k - k // 2 + 1)
+    offsets = offsets[np.argsort(np.abs(offsets), kind="stable")]
+    return (np.arange(quantity)[:, None] + offsets) % quantity
+
+
+def grid_shape(quantity:int) -> tuple:
+    """(rows, columns) of the squarest grid with exactly quantity cells, rows <= columns."""
+    rows = int(np.sqrt(quantity))
+    while quantity % rows:
+        rows -= 1
+    return rows, quantity // rows
+
+
+def von_neumann_neighbors(quantity:int) -> np.ndarray:
+    """
+    (N, 5) indices of each particle and its up, down, left and right neighbors
+    on a wrapped rows x columns grid of exactly N cells (see grid_shape).
+    A prime N gives a single row, where up and down are the particle itself,
+    and with two rows up and down are the same particle.
+    """
+    rows, columns = grid_shape(quantity)
+    row, column = np.divmod(np.arange(quantity), columns)
+    return np.stack([
+        row * columns + column,
+        (row - 1) % rows * columns + column,
+        (row + 1) % rows * columns + column,
+        row * columns + (column - 1) % columns,
+        row * columns + (column + 1) % columns,
+    ], axis=1)
+
+
+def random_neighbors(quantity:int, k:int, rng:np.random.Generator) -> np.ndarray:
+    """
+    (N, k + 1) indices of each particle and k distinct random informants,
+    drawn without replacement from the other N - 1 particles.
+    """
+    if not 0 <= k < quantity:
+        raise ValueError(f"random topology needs 0 <= neighbors < {quantity}, got {k}")
+    if 2 * k > quantity - 1:
+        # dense: the first k of a random permutation of the others of each row
+        others = np.argsort(rng.random((quantity, quantity - 1)), axis=1)[:, :k]
+    else:
+        # sparse: redraw the rows with a repeated informant, rare when 2k <= N - 1
+        others = rng.integers(0, quantity - 1, size=(quantity, k))
+        while True:
+            ordered = np.sort(others, axis=1)
+            repeated = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+            if not repeated.any():
+                break
+            others[repeated] = rng.integers(0, quantity - 1, size=(int(repeated.sum()), k))
+    # skip the particle itself: 0..N-2 maps to the N - 1 other indices
+    particles = np.arange(quantity)[:, None]
+    others = others + (others >= particles)
+    return np.concatenate([particles, others], axis=1).astype(np.intp)
+
+
+def distinct_optima(positions:np.ndarray, values:np.ndarray, radius:float = 0.1,
+                    tolerance:float = 1e-3) -> tuple:
+    """
+    Greedily group the positions whose value is below tolerance into optima
+    at least radius apart, best first.
+
+    Returns:
+        tuple: (M, D) array of optima positions and their (M,) values.
+    """
+    candidates = np.flatnonzero(values <= tolerance)
+    candidates = candidates[np.argsort(values[candidates], kind="stable")]
+    points = positions[candidates]
+    optima = []
+    while len(candidates):
+        optima.append(candidates[0])
+        far = np.linalg.norm(points - points[0], axis=1) > radius
+        candidates, points = candidates[far], points[far]
+    optima = np.array(optima, dtype=np.intp)
+    return positions[optima], values[optima]
+
+
+class PSO():
+    """Swarm Intelligence algorithm using PSO aproach, over arrays."""
+    def __init__(self, quantity_pop:int, max_interactions:int, objective=himmelblau,
+                 bounds=(-6.0, 6.0), dimensions:int = 2, max_velocity=None,
+                 boundary:str = "clip", seed=None, verbose:bool = True,
+                 topology:str = "global", neighbors:int = 2, rebuild_every:int = None) -> None:
+        """
+        Parameters:
+            quantity_pop (int): Number of particles N.
+            max_interactions (int): Iterations done by run_pso.
+            objective (callable): Maps an (N, D) array of positions to N values to minimize.
+            bounds (tuple | np.ndarray): (low, high) for every dimension or a (D, 2) array.
+            dimensions (int): D, used when bounds is a single pair.
+            max_velocity (float | np.ndarray): Velocity clamp per dimension, None for no clamp.
+            boundary (str): What happens to particles leaving the bounds:
+                "clip" stops them at the bound with zero velocity on that axis,
+                "reflect" mirrors them back inside and inverts that velocity,
+                "none" lets them leave.
+            seed: Seed of the np.random.Generator.
+            verbose (bool): Print the best value of each iteration.
+            topology (str): Whose best attracts each particle: "global" (whole swarm),
+                "ring", "von_neumann" or "random" (local best of its neighbors).
+            neighbors (int): k of the ring and random topologies.
+            rebuild_every (int): Draw a new random topology every this many iterations.
+        """
+        if boundary not in BOUNDARIES:
+            raise ValueError(f"unknown boundary {boundary}, use one of {BOUNDARIES}")
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"unknown topology {topology}, use one of {TOPOLOGIES}")
+        bounds = bounds_array(bounds, dimensions)
+
+        self.quantity_pop = quantity_pop
+        self.interactions = max_interactions
+        self.objective = objective
+        self.low = bounds[:, 0].copy()
+        self.high = bounds[:, 1].copy()
+        self.dimensions = len(bounds)
+        self.max_velocity = None if max_velocity is None else np.broadcast_to(
+            np.asarray(max_velocity, dtype=float), (self.dimensions,)).copy()
+        self.boundary = boundary
+        self.topology = topology
+        self.k = neighbors
+        self.rebuild_every = rebuild_every
+        self.rng = np.random.default_rng(seed)
+        self.verbose = verbose
+
+        shape = (quantity_pop, self.dimensions)
+        self.positions = np.zeros(shape)
+        self.velocities = np.zeros(shape)
+        self.personal_best_positions = np.zeros(shape)
+        self.personal_best_values = np.full(quantity_pop, np.inf)
+        self.values = np.full(quantity_pop, np.inf)
+        self._buffer = np.zeros(shape)
+        self.neighbors = None
+
+        self.global_best_index = 0
+        self.iteration = 0
+        # row i: best value and best position after iteration i (row 0 is the initial swarm)
+        self.history = np.full((max_interactions + 1, self.dimensions + 1), np.nan)
+
+    @property
+    def global_best_position(self) -> np.ndarray:
+        """Best position found by the swarm."""
+        return self.personal_best_positions[self.global_best_index]
+
+    @property
+    def global_best_value(self) -> float:
+        """Best value found by the swarm."""
+        return float(self.personal_best_values[self.global_best_index])
+
+    def evaluate(self, positions:np.ndarray) -> np.ndarray:
+        """Objective values of an (N, D) array of positions."""
+        return np.asarray(self.objective(positions), dtype=float)
+
+    def initialize_swarm(self) -> None:
+        """Initializes the swarm at random positions with zero velocity."""
+        self.positions[:] = self.rng.uniform(self.low, self.high, size=self.positions.shape)
+        self.velocities[:] = 0.0
+        self.values[:] = self.evaluate(self.positions)
+        self.personal_best_positions[:] = self.positions
+        self.personal_best_values[:] = self.values
+        self.global_best_index = int(np.argmin(self.personal_best_values))
+        self.iteration = 0
+        self.build_topology()
+        self.history[:] = np.nan
+        self.record()
+
+    def build_topology(self) -> None:
+        """Build the (N, k) neighbor index array of the local topologies."""
+        if self.topology == "ring":
+            self.neighbors = ring_neighbors(self.quantity_pop, self.k)
+        elif self.topology == "von_neumann":
+            self.neighbors = von_neumann_neighbors(self.quantity_pop)
+        elif self.topology == "random":
+            self.neighbors = random_neighbors(self.quantity_pop, self.k, self.rng)
+
+    def record(self) -> None:
+        """Store the global best of the current iteration in the history array."""
+        if self.iteration < len(self.history):
+            self.history[self.iteration, 0] = self.global_best_value
+            self.history[self.iteration, 1:] = self.global_best_position
+
+    def receive(self, indices:np.ndarray, positions:np.ndarray, values:np.ndarray) -> None:
+        """Replace the particles at indices by migrants at rest at the given positions."""
+        self.positions[indices] = positions
+        self.velocities[indices] = 0.0
+        self.values[indices] = values
+        self.personal_best_positions[indices] = positions
+        self.personal_best_values[indices] = values
+        self.update_global_best()
+
+    def local_best_indices(self) -> np.ndarray:
+        """Index of the best personal best among the neighbors of each particle."""
+        neighbor_values = self.personal_best_values[self.neighbors]
+        best = np.argmin(neighbor_values, axis=1)
+        return self.neighbors[np.arange(self.quantity_pop), best]
+
+    def social_targets(self) -> np.ndarray:
+        """Position each particle is attracted to by the social term, the global or local best."""
+        if self.neighbors is None:
+            return self.global_best_position
+        return self.personal_best_positions[self.local_best_indices()]
+
+    def update_velocities(self, w:float, c1:float, c2:float) -> None:
+        """
+        v = w v + c1 r1 (pbest - x) + c2 r2 (best - x), with r1 and r2 drawn per particle.
+        w: Inertia weight
+        c1: Cognitive parameter
+        c2: Social parameter
+        """
+        r1 = self.rng.random((self.quantity_pop, 1))
+        r2 = self.rng.random((self.quantity_pop, 1))
+        buffer = self._buffer
+
+        self.velocities *= w
+        np.subtract(self.personal_best_positions, self.positions, out=buffer)
+        buffer *= r1
+        buffer *= c1
+        self.velocities += buffer
+        np.subtract(self.social_targets(), self.positions, out=buffer)
+        buffer *= r2
+        buffer *= c2
+        self.velocities += buffer
+
+        if self.max_velocity is not None:
+            np.clip(self.velocities, -self.max_velocity, self.max_velocity, out=self.velocities)
+
+    def update_positions(self) -> None:
+        """Move the particles and apply the boundary handling."""
+        self.positions += self.velocities
+        if self.boundary == "clip":
+            outside = (self.positions < self.low) | (self.positions > self.high)
+            np.clip(self.positions, self.low, self.high, out=self.positions)
+            self.velocities[outside] = 0.0
+        elif self.boundary == "reflect":
+            below = self.positions < self.low
+            above = self.positions > self.high
+            np.subtract(2 * self.low, self.positions, out=self.positions, where=below)
+            np.subtract(2 * self.high, self.positions, out=self.positions, where=above)
+            # particles faster than the box width may still be outside after one reflection
+            np.clip(self.positions, self.low, self.high, out=self.positions)
+            np.negative(self.velocities, out=self.velocities, where=below | above)
+
+    def update_personal_bests(self) -> None:
+        """Evaluate the swarm and keep the improved personal bests."""
+        self.values[:] = self.evaluate(self.positions)
+        improved = self.values < self.personal_best_values
+        np.copyto(self.personal_best_positions, self.positions, where=improved[:, None])
+        np.copyto(self.personal_best_values, self.values, where=improved)
+
+    def update_global_best(self) -> None:
+        """Index of the best personal best of the swarm."""
+        self.global_best_index = int(np.argmin(self.personal_best_values))
+
+    def step(self, w:float, c1:float, c2:float) -> float:
+        """One iteration of the whole swarm, returns the global best value."""
+        self.update_velocities(w, c1, c2)
+        self.update_positions()
+        self.update_personal_bests()
+        self.update_global_best()
+        self.iteration += 1
+        if self.topology == "random" and self.rebuild_every and self.iteration % self.rebuild_every == 0:
+            self.build_topology()
+        self.record()
+        return self.global_best_value
+
+    def run_pso(self, w:float, c1:float, c2:float) -> np.ndarray:
+        """Execute the PSO algorithm and return the history array.
+        w: Inertia weight
+        c1: Cognitive parameter
+        c2: Social parameter
+        """
+        self.initialize_swarm()
+        for interation in range(self.interactions):
+            best = self.step(w, c1, c2)
+            if self.verbose:
+                print(f'Iteration {interation + 1}: Best Value = {best:.6f}')
+        return self.history
+
+    def optima(self, radius:float = 0.1, tolerance:float = 1e-3) -> tuple:
+        """Distinct optima among the personal bests, see distinct_optima."""
+        return distinct_optima(self.personal_best_positions, self.personal_best_values, radius, tolerance)
+
+
+def migrate(swarm:PSO, board:np.ndarray, island:int, migrants:int, policy:str) -> None:
+    """
+    Bring the bests of other islands into the swarm.
+
+    Parameters:
+        swarm (PSO): Swarm of this island.
+        board (np.ndarray): (K, D + 1) best value and position of every island.
+        island (int): Row of this island in the board.
+        migrants (int): Number of particles replaced.
+        policy (str): "best_to_worst" replaces the worst particles by the bests
+            of the best other islands, "random" replaces random particles by
+            the bests of random other islands.
+    """
+    others = np.delete(np.arange(len(board)), island)
+    quantity = min(migrants, len(others), swarm.quantity_pop)
+    if policy == "best_to_worst":
+        sources = others[np.argsort(board[others, 0], kind="stable")[:quantity]]
+        worst = np.argpartition(-swarm.personal_best_values, quantity - 1)[:quantity]
+        targets = worst[np.argsort(-swarm.personal_best_values[worst], kind="stable")]
+    else:
+        sources = swarm.rng.choice(others, size=quantity, replace=False)
+        targets = swarm.rng.choice(swarm.quantity_pop, size=quantity, replace=False)
+    swarm.receive(targets, board[sources, 1:], board[sources, 0])
+
+
+def _run_island(island, islands, quantity_pop, iterations, parameters, migration_interval,
+                migrants, policy, seed, board_name, history_name, barrier, pso_kwargs):
+    """Worker of run_islands: one swarm that publishes and receives bests every migration_interval."""
+    board_memory = shared_memory.SharedMemory(name=board_name)
+    history_memory = shared_memory.SharedMemory(name=history_name)
+    swarm = board = history = None
+    try:
+        swarm = PSO(quantity_pop, iterations, seed=seed, verbose=False, **pso_kwargs)
+        width = swarm.dimensions + 1
+        board = np.ndarray((islands, width), buffer=board_memory.buf)
+        history = np.ndarray((islands, iterations + 1, width), buffer=history_memory.buf)
+        swarm.history = history[island] # the swarm records straight into shared memory
+
+        swarm.initialize_swarm()
+        for iteration in range(1, iterations + 1):
+            swarm.step(*parameters)
+            if islands > 1 and migration_interval and iteration % migration_interval == 0:
+                board[island, 0] = swarm.global_best_value
+                board[island, 1:] = swarm.global_best_position
+                barrier.wait()
+                migrate(swarm, board, island, migrants, policy)
+                # nobody publishes the next bests before every island has read these
+                barrier.wait()
+    except threading.BrokenBarrierError:
+        raise RuntimeError(f"island {island}: the migration barrier broke, "
+                           "another island failed or did not arrive in time") from None
+    except BaseException:
+        barrier.abort()
+        raise
+    finally:
+        # the array views must be gone before the shared memory is closed
+        swarm = board = history = None
+        board_memory.close()
+        history_memory.close()
+
+
+def run_islands(islands:int, quantity_pop:int, iterations:int, w=0.7, c1=2.0, c2=2.0,
+                migration_interval:int = 10, migrants:int = 1, policy:str = "best_to_worst",
+                seed=None, barrier_timeout:float = 60.0, **pso_kwargs) -> dict:
+    """
+    Run K swarms, each in its own process, exchanging their best positions
+    through shared memory every migration_interval iterations.
+
+    Parameters:
+        islands (int): Number of swarms K, one process each.
+        quantity_pop (int): Particles per swarm.
+        iterations (int): Iterations of every swarm.
+        w, c1, c2 (float | list): PSO parameters, a scalar or one value per island.
+        migration_interval (int): Iterations between migrations, 0 or None for isolated swarms.
+        migrants (int): Particles replaced in each island per migration.
+        policy (str): Migration policy, one of MIGRATIONS, see migrate.
+        seed: Seed of the np.random.SeedSequence the island seeds are spawned from.
+        barrier_timeout (float): Seconds an island waits for the others at a migration
+            before giving up, None to wait forever.
+        **pso_kwargs: Other PSO arguments (objective, bounds, topology...), the objective
+            must be picklable (a module level function).
+
+    Returns:
+        dict: history (K, iterations + 1, D + 1) of each island, island_best_values,
+        best_island, best_value and best_position.
+    """
+    if policy not in MIGRATIONS:
+        raise ValueError(f"unknown migration policy {policy}, use one of {MIGRATIONS}")
+    dimensions = len(bounds_array(pso_kwargs.get("bounds", (-6.0, 6.0)), pso_kwargs.get("dimensions", 2)))
+    parameters = np.column_stack([np.broadcast_to(np.asarray(value, dtype=float), (islands,)) for value in (w, c1, c2)])
+    seeds = np.random.SeedSequence(seed).spawn(islands)
+
+    width = dimensions + 1
+    board_memory = shared_memory.SharedMemory(create=True, size=islands * width * 8)
+    history_memory = shared_memory.SharedMemory(create=True, size=islands * (iterations + 1) * width * 8)
+    try:
+        barrier = multiprocessing.Barrier(islands, timeout=barrier_timeout)
+        processes = [
+            multiprocessing.Process(target=_run_island, args=(
+                island, islands, quantity_pop, iterations, tuple(float(p) for p in parameters[island]),
+                migration_interval, migrants, policy, seeds[island],
+                board_memory.name, history_memory.name, barrier, pso_kwargs))
+            for island in range(islands)
+        ]
+        for process in processes:
+            process.start()
+        # an island killed before it can abort the barrier (OOM, SIGKILL) would leave
+        # the others waiting for it, the first failed exit aborts the barrier for them
+        running = {process.sentinel: process for process in processes}
+        while running:
+            for sentinel in connection.wait(list(running)):
+                process = running.pop(sentinel)
+                process.join()
+                if process.exitcode != 0:
+                    barrier.abort()
+        failed = {island: process.exitcode for island, process in enumerate(processes) if process.exitcode != 0}
+        if failed:
+            raise RuntimeError(f"islands failed, exit codes by island: {failed}")
+
+        history = np.ndarray((islands, iterations + 1, width), buffer=history_memory.buf).copy()
+    finally:
+        board_memory.close()
+        board_memory.unlink()
+        history_memory.close()
+        history_memory.unlink()
+
+    final = history[:, -1]
+    best_island = int(np.argmin(final[:, 0]))
+    return {
+        "history": history,
+        "island_best_values": final[:, 0].copy(),
+        "best_island": best_island,
+        "best_value": float(final[best_island, 0]),
+        "best_position": final[best_island, 1:].copy(),
+    }
+
+
+def _run_sweep_point(task:tuple) -> np.ndarray:
+    """Worker of sweep: history of one PSO run."""
+    (w, c1, c2), quantity_pop, iterations, seed, pso_kwargs = task
+    swarm = PSO(quantity_pop, iterations, seed=seed, verbose=False, **pso_kwargs)
+    return swarm.run_pso(w, c1, c2)
+
+
+def sweep(w, c1, c2, quantity_pop:int = 30, iterations:int = 100, repeats:int = 1,
+          workers:int = None, seed=None, **pso_kwargs) -> dict:
+    """
+    Run the PSO over the (w, c1, c2) grid, like the notebook sweeps over c1 and c2,
+    spreading the grid points over a process pool.
+
+    Parameters:
+        w, c1, c2 (float | list): Values of each parameter, the grid is their product.
+        quantity_pop (int): Particles per run.
+        iterations (int): Iterations per run.
+        repeats (int): Runs per grid point, with different seeds.
+        workers (int): Processes of the pool, 1 runs serially, None uses every core.
+        seed: Seed of the np.random.SeedSequence the run seeds are spawned from.
+        **pso_kwargs: Other PSO arguments, the objective must be picklable.
+
+    Returns:
+        dict: parameters (G, 3), histories (G, repeats, iterations + 1, D + 1)
+        and best_values (G, repeats).
+    """
+    grid = list(itertools.product(np.atleast_1d(w), np.atleast_1d(c1), np.atleast_1d(c2)))
+    seeds = np.random.SeedSequence(seed).spawn(len(grid) * repeats)
+    tasks = [
+        (tuple(float(p) for p in point), quantity_pop, iterations, seeds[index * repeats + repeat], pso_kwargs)
+        for index, point in enumerate(grid) for repeat in range(repeats)
+    ]
+    if workers == 1:
+        histories = list(map(_run_sweep_point, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            histories = list(executor.map(_run_sweep_point, tasks, chunksize=max(1, len(tasks) // (4 * (workers or 1)))))
+
+    histories = np.stack(histories).reshape(len(grid), repeats, iterations + 1, -1)
+    return {
+        "parameters": np.array(grid, dtype=float),
+        "histories": histories,
+        "best_values": histories[:, :, -1, 0],
+    }
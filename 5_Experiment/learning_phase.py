@@ -0,0 +1,176 @@
+"""
+LearningPhase of SchedulerExperiment.ipynb over a compiled schedule.
+
+The genetic algorithm that learns the allocation of tasks to processors,
+with the population as one (population_size, n_tasks) array: the makespans
+of a generation come from one CompiledSchedule.evaluate batch (cached per
+chromosome) and are reused by the elitism, the parent selection and the
+best of the generation, instead of running a new Scheduler every time.
+"""
+
+import time
+
+import numpy as np
+
+from scheduler import CompiledSchedule
+
+
+def rule30_population(size:int, length:int, timesteps:int, rng:np.random.Generator) -> np.ndarray:
+    """
+    Random 0/1 rows evolved by the elementary Rule 30, like CellularAutomata.run
+    (the boundary cells keep their initial state), for every row at once.
+
+    Returns:
+        np.ndarray: (size, length) final grids.
+    """
+    grid = rng.integers(0, 2, size=(size, length), dtype=np.int8)
+    for _ in range(timesteps):
+        left, center, right = grid[:, :-2], grid[:, 1:-1], grid[:, 2:]
+        grid[:, 1:-1] = left ^ (center | right)
+    return grid
+
+
+class LearningPhase:
+    """
+    A class to represent a learning phase. Run a Genetic Algorithm to learn the
+    best allocation of tasks to processors, minimizing the makespan.
+    """
+    def __init__(self,
+                graph,
+                processor_quantity: int = 2,
+
+                population_size: int = 10,
+                mutation_rate: float = 0.1,
+                crossover_rate: float = 0.8,
+                elitism_rate: float = 0.1,
+                max_generations: int = 100,
+                release_delay = 1,
+                seed = None,
+                verbose: bool = True):
+        """
+        Initializes a new LearningPhase instance.
+
+        Args:
+            graph (nx.DiGraph): The directed graph representing the tasks and their dependencies.
+            processor_quantity (int): The number of processors.
+            population_size (int): The size of the population in the genetic algorithm.
+            mutation_rate (float): The probability of mutation of each gene.
+            crossover_rate (float): The probability of each gene coming from the better parent.
+            elitism_rate (float): The percentage of the population to be preserved as elite individuals.
+            max_generations (int): The maximum number of generations in the genetic algorithm.
+            release_delay: See scheduler.Scheduler, 1 reproduces the notebook Scheduler.
+            seed: Seed of the np.random.Generator.
+            verbose (bool): Print the generations/sec at the end of the run.
+        """
+        self.graph = graph
+        self.processor_quantity = processor_quantity
+
+        self.population_size = population_size
+        self.mutation_rate = mutation_rate
+        self.crossover_rate = crossover_rate
+        self.elitism_rate = elitism_rate
+        self.max_generations = max_generations
+        self.rng = np.random.default_rng(seed)
+        self.verbose = verbose
+
+        self.schedule = CompiledSchedule(graph, processor_quantity, release_delay)
+        self.best_hystory = []
+        self.best_makespans = []
+        self.generations_per_sec = 0.0
+
+    def initialize_population(self) -> np.ndarray:
+        """
+        Initializes the population with Rule 30 cellular automata grids.
+
+        Returns:
+            np.ndarray: (population_size, n_tasks) allocations.
+        """
+        return rule30_population(self.population_size, len(self.schedule), 10, self.rng)
+
+    def evaluate_fitness(self, population: np.ndarray) -> np.ndarray:
+        """
+        Evaluates the makespan of every allocation, lower is better.
+
+        Args:
+            population (np.ndarray): (pop, n_tasks) allocations, or a single allocation.
+
+        Returns:
+            np.ndarray: The makespan of each allocation.
+        """
+        return self.schedule.evaluate(np.atleast_2d(population))
+
+    def select_parents(self, population: np.ndarray, makespans: np.ndarray, quantity: int) -> tuple:
+        """
+        Selects quantity pairs of parents by tournaments of two, the better one first.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (quantity, n_tasks) better and worse parents.
+        """
+        first = self.rng.integers(0, len(population), size=quantity)
+        second = self.rng.integers(0, len(population), size=quantity)
+        first_wins = makespans[first] <= makespans[second]
+        better = np.where(first_wins, first, second)
+        worse = np.where(first_wins, second, first)
+        return population[better], population[worse]
+
+    def crossover(self, parent1: np.ndarray, parent2: np.ndarray) -> np.ndarray:
+        """
+        Uniform crossover, each gene comes from parent1 with probability crossover_rate.
+
+        Returns:
+            np.ndarray: The children allocations.
+        """
+        from_parent1 = self.rng.random(parent1.shape) < self.crossover_rate
+        return np.where(from_parent1, parent1, parent2)
+
+    def mutate(self, population: np.ndarray) -> np.ndarray:
+        """
+        Moves each gene, with probability mutation_rate, to a different processor.
+
+        Returns:
+            np.ndarray: The mutated allocations.
+        """
+        if self.processor_quantity < 2:
+            return population
+        mutated = self.rng.random(population.shape) < self.mutation_rate
+        shift = self.rng.integers(1, self.processor_quantity, size=population.shape, dtype=population.dtype)
+        return np.where(mutated, (population + shift) % self.processor_quantity, population)
+
+    def elitism_selection(self, population: np.ndarray, makespans: np.ndarray) -> np.ndarray:
+        """
+        Indices of the elite, the elitism_rate of the population with the lowest makespans.
+        """
+        elite_size = int(self.elitism_rate * self.population_size)
+        if elite_size == 0:
+            return np.empty(0, dtype=np.intp)
+        elite = np.argpartition(makespans, elite_size - 1)[:elite_size]
+        return elite[np.argsort(makespans[elite], kind="stable")]
+
+    def run_genetic_algorithm(self) -> np.ndarray:
+        """
+        Runs the genetic algorithm to find the best allocation of tasks to processors.
+
+        Returns:
+            np.ndarray: The best allocation found.
+        """
+        start = time.perf_counter()
+        population = self.initialize_population()
+        makespans = self.evaluate_fitness(population)
+        for _ in range(self.max_generations):
+            elite = self.elitism_selection(population, makespans)
+            parent1, parent2 = self.select_parents(population, makespans, self.population_size - len(elite))
+            children = self.mutate(self.crossover(parent1, parent2))
+            population = np.concatenate((population[elite], children))
+            makespans = np.concatenate((makespans[elite], self.evaluate_fitness(children)))
+
+            best = int(np.argmin(makespans))
+            self.best_hystory.append(population[best].copy())
+            self.best_makespans.append(float(makespans[best]))
+
+        seconds = time.perf_counter() - start
+        self.generations_per_sec = self.max_generations / seconds if seconds else float("inf")
+        if self.verbose:
+            print(f"{self.max_generations} generations in {seconds:.3f}s "
+                  f"({self.generations_per_sec:.1f} generations/sec, "
+                  f"{self.schedule.misses} schedules, {self.schedule.hits} cache hits)")
+        return population[int(np.argmin(makespans))]
@@ -0,0 +1,371 @@
+"""
+Discrete-event version of the Scheduler of SchedulerExperiment.ipynb.
+
+Instead of advancing the clock one tick at a time and scanning every
+processor and task, the scheduler keeps a min-heap of completion events and
+jumps to the next one. Each task keeps a counter of unfinished predecessors,
+so its successors become ready in O(1) when it finishes, and tasks and
+processors are arrays indexed by id.
+
+With release_delay=1 (the default) the schedules are the ones of the
+notebook: a task ending at e frees its processor and its successors at
+e + 1, and each free processor takes the lowest id ready task allocated to
+it (or a random ready task when there is no allocation).
+"""
+
+import heapq
+import random
+
+import numpy as np
+
+
+class Scheduler:
+    """
+    Schedules a DAG of tasks on identical processors with discrete events.
+
+    Attributes:
+        names (list): Name of each task id, the graph nodes in sorted order.
+        durations (np.ndarray): Duration of each task id.
+        start_time (np.ndarray): Start time of each task after run.
+        end_time (np.ndarray): End time (start + duration) of each task after run.
+        processed_by (np.ndarray): Processor id of each task after run.
+    """
+
+    def __init__(self, graph=None, processor_quantity:int = 2, release_delay = 1, seed = None,
+                 durations = None, edges = None):
+        """
+        Initializes a new Scheduler instance.
+
+        Args:
+            graph: A networkx.DiGraph like object, with graph.nodes[node]["duration"]
+                and graph.edges, or None when durations and edges are given.
+            processor_quantity (int): The number of processors.
+            release_delay: Time between the end of a task and the moment its processor
+                and its successors are released, 1 reproduces the notebook ticks.
+            seed: Seed of the random allocation.
+            durations (list): Duration of each task id, instead of a graph.
+            edges (list): (predecessor id, successor id) pairs, instead of a graph.
+        """
+        if graph is not None:
+            try:
+                names = sorted(graph.nodes)
+            except TypeError:
+                names = list(graph.nodes)
+            ids = {name: i for i, name in enumerate(names)}
+            durations = [graph.nodes[name]["duration"] for name in names]
+            edges = [(ids[u], ids[v]) for u, v in graph.edges]
+        elif durations is None:
+            raise ValueError("give a graph or durations and edges")
+        else:
+            names = list(range(len(durations)))
+
+        self.names = names
+        self.durations = np.asarray(durations)
+        if np.any(self.durations < 0):
+            raise ValueError("durations must not be negative")
+        self.processor_quantity = processor_quantity
+        self.release_delay = release_delay
+        self.random = random.Random(seed)
+
+        # successors in CSR form: the successors of task i are targets[offsets[i]:offsets[i + 1]]
+        quantity = len(self.durations)
+        edges = np.unique(np.asarray(edges, dtype=np.int64).reshape(-1, 2), axis=0)
+        order = np.argsort(edges[:, 0], kind="stable")
+        self.successor_targets = edges[order, 1]
+        self.successor_offsets = np.zeros(quantity + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edges[:, 0], minlength=quantity), out=self.successor_offsets[1:])
+        self.indegree = np.bincount(edges[:, 1], minlength=quantity)
+        self.predecessors = edges
+
+        self.start_time = np.zeros(quantity, dtype=self.durations.dtype)
+        self.end_time = self.durations.copy()
+        self.processed_by = np.full(quantity, -1, dtype=np.int64)
+        self.time = 0
+
+    def __len__(self) -> int:
+        return len(self.durations)
+
+    @property
+    def makespan(self):
+        """Largest end time of the last run."""
+        return self.end_time.max() if len(self) else 0
+
+    def run(self, grid:np.ndarray = None):
+        """
+        Runs the scheduler.
+
+        Args:
+            grid (np.ndarray): Processor id of each task id, None for a random allocation.
+
+        Returns:
+            The makespan.
+        """
+        quantity = len(self)
+        if grid is not None:
+            grid = np.asarray(grid, dtype=np.int64)
+            if grid.shape != (quantity,):
+                raise ValueError(f"grid must have one processor per task, {quantity}, got {grid.shape}")
+            if quantity and (grid.min() < 0 or grid.max() >= self.processor_quantity):
+                raise ValueError(f"grid allocates tasks to processors outside 0..{self.processor_quantity - 1}")
+            allocation = grid.tolist()
+
+        durations = self.durations.tolist()
+        offsets = self.successor_offsets.tolist()
+        targets = self.successor_targets.tolist()
+        waiting = self.indegree.tolist()
+        start_time = [0] * quantity
+        processed_by = [-1] * quantity
+        delay = self.release_delay
+
+        # grid: ready task ids per processor, random: one list of ready tasks
+        ready = [[] for _ in range(self.processor_quantity)] if grid is not None else []
+        free = list(range(self.processor_quantity))
+        events = [] # (release time, task id, processor id)
+        completed = 0
+        time = 0
+
+        def enable(task):
+            if grid is not None:
+                heapq.heappush(ready[allocation[task]], task)
+            else:
+                ready.append(task)
+
+        def start(task, processor):
+            start_time[task] = time
+            processed_by[task] = processor
+            heapq.heappush(events, (time + durations[task] + delay, task, processor))
+
+        for task in range(quantity):
+            if waiting[task] == 0:
+                enable(task)
+
+        while True:
+            if grid is not None:
+                idle = []
+                for processor in free:
+                    if ready[processor]:
+                        start(heapq.heappop(ready[processor]), processor)
+                    else:
+                        idle.append(processor)
+                free = idle
+            else:
+                # like allocate_task_processor: random ready tasks to the lowest free processors
+                free.sort()
+                while free and ready:
+                    index = self.random.randrange(len(ready))
+                    ready[index], ready[-1] = ready[-1], ready[index]
+                    start(ready.pop(), free.pop(0))
+
+            if not events:
+                break
+            time = events[0][0]
+            while events and events[0][0] == time:
+                _, task, processor = heapq.heappop(events)
+                completed += 1
+                free.append(processor)
+                for successor in targets[offsets[task]:offsets[task + 1]]:
+                    waiting[successor] -= 1
+                    if waiting[successor] == 0:
+                        enable(successor)
+
+        if completed < quantity:
+            blocked = [self.names[task] for task in range(quantity) if waiting[task] > 0][:10]
+            raise ValueError(f"{quantity - completed} tasks never became ready, the graph has a cycle: {blocked}")
+
+        # float delays or durations make float times
+        self.start_time = np.array(start_time, dtype=np.result_type(self.durations, np.asarray(delay)))
+        self.end_time = self.start_time + self.durations
+        self.processed_by = np.array(processed_by, dtype=np.int64)
+        self.time = time
+        return self.makespan
+
+    def task_data(self) -> list:
+        """
+        Returns the data of every task, with the keys of Task.task_data in the notebook.
+
+        Returns:
+            list: One dict per task, in id order.
+        """
+        dependencies = [[] for _ in range(len(self))]
+        for predecessor, successor in self.predecessors.tolist():
+            dependencies[successor].append(self.names[predecessor])
+        return [
+            {
+                "name": str(self.names[task]),
+                "duration": self.durations[task].item(),
+                "priority": 0,
+                "status": bool(self.processed_by[task] >= 0),
+                "dependencies": dependencies[task],
+                "enable": bool(self.processed_by[task] >= 0),
+                "processed_by": f"P{self.processed_by[task]}" if self.processed_by[task] >= 0 else None,
+                "start_time": self.start_time[task].item(),
+                "end_time": self.end_time[task].item(),
+            }
+            for task in range(len(self))
+        ]
+
+
+class CompiledSchedule:
+    """
+    Makespans of many allocations of the same task graph, in one batch.
+
+    The graph is checked for cycles and compiled once into plain lists
+    (durations, successors, indegrees and the tasks with no predecessor),
+    and makespans runs the event loop of Scheduler.run(grid) on each row
+    without converting or validating the graph again: O(n_tasks log n_tasks)
+    per allocation, the same schedules as Scheduler.run(grid). No topological
+    order is kept, the event loop releases the tasks as their predecessors end.
+
+    Makespans are cached per chromosome, so repeated allocations are not
+    scheduled again.
+    """
+
+    def __init__(self, graph=None, processor_quantity:int = 2, release_delay = 1,
+                 durations = None, edges = None, cache_size:int = 1_000_000):
+        """
+        Args:
+            graph: A networkx.DiGraph like object, see Scheduler.
+            processor_quantity (int): The number of processors.
+            release_delay: See Scheduler.
+            durations (list): Duration of each task id, instead of a graph.
+            edges (list): (predecessor id, successor id) pairs, instead of a graph.
+            cache_size (int): Maximum number of cached chromosomes, 0 disables the cache.
+        """
+        scheduler = Scheduler(graph, processor_quantity, release_delay, durations=durations, edges=edges)
+        self.names = scheduler.names
+        self.durations = scheduler.durations.astype(np.float64)
+        self.processor_quantity = processor_quantity
+        self.release_delay = release_delay
+        self.indegree = scheduler.indegree
+        self._check_acyclic(scheduler.successor_offsets, scheduler.successor_targets)
+
+        # the event loop reads python lists, converted once here instead of once per allocation
+        offsets, targets = scheduler.successor_offsets.tolist(), scheduler.successor_targets.tolist()
+        self.successor_lists = [targets[offsets[task]:offsets[task + 1]] for task in range(len(self.durations))]
+        self.duration_list = self.durations.tolist()
+        self.indegree_list = self.indegree.tolist()
+        self.sources = np.flatnonzero(self.indegree == 0).tolist()
+
+        self.cache = {}
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.durations)
+
+    def _check_acyclic(self, offsets:np.ndarray, targets:np.ndarray) -> None:
+        """Raises ValueError when the graph has a cycle (Kahn), the event loop would never schedule those tasks."""
+        waiting = self.indegree.copy()
+        order = list(np.flatnonzero(waiting == 0))
+        for task in order:
+            for successor in targets[offsets[task]:offsets[task + 1]]:
+                waiting[successor] -= 1
+                if waiting[successor] == 0:
+                    order.append(successor)
+        if len(order) < len(waiting):
+            raise ValueError(f"{len(waiting) - len(order)} tasks are in a cycle")
+
+    def makespan(self, allocation:list) -> float:
+        """
+        Schedules one allocation with the event loop of Scheduler.run(grid).
+
+        Args:
+            allocation (list): Processor id of each task id, already validated.
+
+        Returns:
+            float: The makespan.
+        """
+        durations = self.duration_list
+        successors = self.successor_lists
+        waiting = self.indegree_list[:]
+        delay = self.release_delay
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        # ready task ids per processor, lowest id first
+        ready = [[] for _ in range(self.processor_quantity)]
+        for task in self.sources:
+            heappush(ready[allocation[task]], task)
+        free = list(range(self.processor_quantity))
+        events = [] # (release time, task id, processor id)
+        makespan = 0.0
+        time = 0
+
+        while True:
+            idle = []
+            for processor in free:
+                if ready[processor]:
+                    task = heappop(ready[processor])
+                    end = time + durations[task]
+                    if end > makespan:
+                        makespan = end
+                    heappush(events, (end + delay, task, processor))
+                else:
+                    idle.append(processor)
+            free = idle
+
+            if not events:
+                return makespan
+            time = events[0][0]
+            while events and events[0][0] == time:
+                _, task, processor = heappop(events)
+                free.append(processor)
+                for successor in successors[task]:
+                    waiting[successor] -= 1
+                    if waiting[successor] == 0:
+                        heappush(ready[allocation[successor]], successor)
+
+    def makespans(self, population:np.ndarray) -> np.ndarray:
+        """
+        Schedules every row of an allocation matrix, without the cache.
+
+        Args:
+            population (np.ndarray): (pop, n_tasks) processor id of each task.
+
+        Returns:
+            np.ndarray: (pop,) makespan of each allocation.
+        """
+        population = np.asarray(population, dtype=np.intp)
+        size, quantity = population.shape
+        if quantity != len(self):
+            raise ValueError(f"allocations must have {len(self)} tasks, got {quantity}")
+        if size == 0 or quantity == 0:
+            return np.zeros(size)
+        if population.min() < 0 or population.max() >= self.processor_quantity:
+            raise ValueError(f"allocations use processors outside 0..{self.processor_quantity - 1}")
+        return np.array([self.makespan(allocation) for allocation in population.tolist()], dtype=np.float64)
+
+    def evaluate(self, population:np.ndarray) -> np.ndarray:
+        """
+        Makespan of each allocation, scheduling only the chromosomes not in the cache
+        (each distinct one once).
+
+        Args:
+            population (np.ndarray): (pop, n_tasks) processor id of each task.
+
+        Returns:
+            np.ndarray: (pop,) makespan of each allocation.
+        """
+        population = np.ascontiguousarray(population, dtype=np.int8 if self.processor_quantity <= 127 else np.int64)
+        keys = [row.tobytes() for row in population]
+        result = np.empty(len(keys))
+        pending = {}
+        for i, key in enumerate(keys):
+            value = self.cache.get(key)
+            if value is None:
+                pending.setdefault(key, []).append(i)
+            else:
+                result[i] = value
+        self.hits += len(keys) - sum(len(indices) for indices in pending.values())
+        self.misses += len(pending)
+
+        if pending:
+            first = [indices[0] for indices in pending.values()]
+            values = self.makespans(population[first])
+            for (key, indices), value in zip(pending.items(), values.tolist()):
+                result[indices] = value
+                if self.cache_size:
+                    if len(self.cache) >= self.cache_size:
+                        del self.cache[next(iter(self.cache))]
+                    self.cache[key] = value
+        return result
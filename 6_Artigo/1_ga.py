@@ -1,47 +1,402 @@
 import random
-import itertools
 import os
+import sys
+import json
+import time
+from collections import OrderedDict, deque, namedtuple
+from functools import cached_property
 import numpy as np
-import pandas as pd
+import pokedex_data
+import process_pool
 
 basedir = os.path.abspath(os.path.dirname(__file__))
 
-pokedex = pd.read_csv(basedir+"/data/pokemon_dataset.csv")
-df_matriz = pd.read_csv(basedir+"/data/matriz_tipo.csv")
-pokedex.fillna("NULL", inplace=True)
+class TypeChart:
+    """TypeChart class holds the type effectiveness matrix as a numpy array.
+    Type names are mapped to integer codes, with an extra "no type" code (NULL)
+    whose row and column are all 1.0, so a pokemon without a second type
+    never changes the multiplier."""
+    NO_TYPE = "NULL"
+
+    def __init__(self, types:list, matrix:np.ndarray):
+        self.types = list(types) + [self.NO_TYPE]
+        self.codes = {name: code for code, name in enumerate(self.types)}
+        self.codes[None] = self.codes[self.NO_TYPE]
+        self.no_type = self.codes[self.NO_TYPE]
+
+        # matrix[attacker, defender], rows are the attacking type in the order of types
+        self.matrix = np.ones((len(self.types), len(self.types)))
+        self.matrix[:-1, :-1] = matrix
+
+        # dual[a1, a2, d1, d2] = matrix[a1, d1] * matrix[a1, d2] * matrix[a2, d1] * matrix[a2, d2]
+        # same multiplication order as the original per pair code
+        m = self.matrix
+        self.dual = (m[:, None, :, None] * m[:, None, None, :]) * m[None, :, :, None] * m[None, :, None, :]
+
+    def encode(self, type_name) -> int:
+        """Returns the integer code of a type name (None or "NULL" is the no type code)."""
+        return self.codes[type_name]
+
+    def multiplier(self, attack_type1:int, attack_type2:int, defense_type1:int, defense_type2:int) -> float:
+        """Returns the attack multiplier of a dual type attacker against a dual type defender, all types as codes."""
+        return self.dual[attack_type1, attack_type2, defense_type1, defense_type2]
+
+class Pokedex:
+    """Pokedex class is a columnar store of the pokedex, one numpy array per column indexed by row.
+    Individuals only keep their row index and read their attributes from here.
+    columns are the pokedex_data columns, kept as they are: the memory mapped cache
+    stays shared between processes, readers widen the values they gather."""
+    def __init__(self, columns:dict, type_chart:TypeChart):
+        self.pokedex_number = columns["pokedex_number"]
+        self.names = columns["name"]
+        self.hp = columns["hp"]
+        self.attack_total = columns["attack_total"]
+        self.defense_total = columns["defense_total"]
+        self.speed = columns["speed"]
+        self.capture_rate = columns["capture_rate"]
+        self.legendary = columns["legendary"]
+        # type codes are positions in the type chart, the same as type_chart.encode
+        self.type1 = columns["type1"]
+        self.type2 = columns["type2"]
+        self.type_names = type_chart.types
+        self.no_type = type_chart.no_type
+        self.rng = np.random.default_rng()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def sample(self, size=None, rng:np.random.Generator = None):
+        """Samples pokedex rows uniformly with replacement, size follows numpy (None returns a single int)."""
+        rng = self.rng if rng is None else rng
+        return rng.integers(0, len(self), size=size)
+
+    def type_name(self, code:int) -> str:
+        """Returns the type name of a type code, None for the no type code."""
+        return None if code == self.no_type else self.type_names[code]
+
+class PopulationEvaluator:
+    """PopulationEvaluator class computes the fitness of a whole population in one numpy pass.
+    Teams are integer arrays of pokedex row indices, shape (pop, 6), and the oponent team is shape (6,).
+    The stats are the small integer columns of the pokedex, the gathered values are cast to float
+    before any division so the result is the float64 one of the CSV values."""
+    def __init__(self, pokedex:Pokedex, type_chart:TypeChart):
+        self.hp = pokedex.hp
+        self.attack = pokedex.attack_total
+        self.defense = pokedex.defense_total
+        self.speed = pokedex.speed
+        self.type1 = pokedex.type1
+        self.type2 = pokedex.type2
+        self.dual = type_chart.dual
+
+    def pair_fitness(self, teams:np.ndarray, oponent_team:np.ndarray) -> np.ndarray:
+        """Returns the (pop, 6, 6) tensor with the fitness of every individual against every oponent individual.
+        hp ratio + attack/defense * type multiplier * speed ratio, as in calculate_fitness_individual."""
+        individual = np.asarray(teams)[:, :, None]
+        oponent = np.asarray(oponent_team)[None, None, :]
+
+        attack_multiplier = self.dual[self.type1[individual], self.type2[individual],
+                                      self.type1[oponent], self.type2[oponent]]
+        hp_coef = self.hp[individual].astype(float) / self.hp[oponent].astype(float)
+        speed_coef = self.speed[individual].astype(float) / self.speed[oponent].astype(float)
+        attack_coef = self.attack[individual].astype(float) / self.defense[oponent].astype(float)
+
+        return hp_coef + (attack_coef * attack_multiplier) * speed_coef
+
+    def slot_fitness(self, pair_fitness:np.ndarray) -> np.ndarray:
+        """Returns the (..., 6) contribution of each team slot, the sum of its fitness against the oponents."""
+        # cumsum adds sequentially, np.sum would use pairwise summation and change the last bits
+        return np.cumsum(pair_fitness, axis=-1)[..., -1]
+
+    def total_fitness(self, slot_fitness:np.ndarray) -> np.ndarray:
+        """Returns the fitness of each team from its slot contributions.
+        Teams are always summed slot by slot, so a total rebuilt from cached
+        contributions is exactly the same as a full recompute."""
+        return np.cumsum(slot_fitness, axis=-1)[..., -1]
+
+    def team_fitness(self, pair_fitness:np.ndarray) -> np.ndarray:
+        """Returns the (pop,) fitness of each team, summing the pairs in the same order as calculate_team_fitness."""
+        return self.total_fitness(self.slot_fitness(pair_fitness))
+
+    def pokemon_contributions(self, oponent_team:np.ndarray) -> np.ndarray:
+        """Returns the (len(pokedex),) contribution every pokedex row would have in any team slot against the oponent team."""
+        rows = np.arange(len(self.hp))[:, None]
+        return self.slot_fitness(self.pair_fitness(rows, oponent_team))[:, 0]
+
+    def pair_matrix(self) -> np.ndarray:
+        """Returns the (len(pokedex), len(pokedex)) fitness of every pokedex row against every other one.
+        Computed once and kept, pair_matrix()[individual, oponent] is the pair_fitness of that pair."""
+        if getattr(self, "_pair_matrix", None) is None:
+            rows = np.arange(len(self.hp))
+            self._pair_matrix = self.pair_fitness(rows[:, None], rows)[:, 0, :]
+        return self._pair_matrix
+
+class LazyData:
+    """LazyData class loads the pokedex and the type chart on first use, from the binary cache of pokedex_data.
+    Importing this module parses nothing, the module level pokedex_store, type_chart, evaluator,
+    pokedex and df_matriz are attributes of the data instance (see __getattr__)."""
+    @cached_property
+    def tables(self) -> pokedex_data.Tables:
+        return pokedex_data.load(basedir + "/data")
+
+    @cached_property
+    def type_chart(self) -> TypeChart:
+        return TypeChart(self.tables.types, self.tables.type_matrix)
+
+    @cached_property
+    def pokedex_store(self) -> Pokedex:
+        return Pokedex(self.tables.pokedex, self.type_chart)
+
+    @cached_property
+    def evaluator(self) -> PopulationEvaluator:
+        return PopulationEvaluator(self.pokedex_store, self.type_chart)
+
+    @cached_property
+    def pokedex(self):
+        """The pokedex as a pandas DataFrame with type names, only for code that still wants one."""
+        import pandas as pd
+        columns = dict(self.tables.pokedex)
+        for name in ("type1", "type2"):
+            columns[name] = [self.type_chart.types[code] for code in columns[name].tolist()]
+        return pd.DataFrame(columns)
+
+    @cached_property
+    def df_matriz(self):
+        """The type chart as the pandas DataFrame of matriz_tipo.csv."""
+        import pandas as pd
+        df_matriz = pd.DataFrame(self.tables.type_matrix.astype(float), columns=self.tables.types)
+        df_matriz.insert(0, "tipo", self.tables.types)
+        return df_matriz
+
+data = LazyData()
+
+def __getattr__(name:str):
+    """Module level access to the lazily loaded data, e.g. module.pokedex_store."""
+    if name in ("pokedex_store", "type_chart", "evaluator", "pokedex", "df_matriz"):
+        return getattr(data, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+BestTeam = namedtuple("BestTeam", ["team", "fitness", "contributions"])
+BestTeam.__doc__ = """Optimal team against an oponent team: pokedex rows, fitness and slot contributions."""
+
+def best_response(oponent_team, team_size:int = 6, allow_duplicates:bool = True,
+                  max_legendary:int = None, min_capture_rate:int = None) -> BestTeam:
+    """Returns the exact best team against the oponent team (a TeamIndividual or its pokedex rows).
+    A team fitness is the sum of its members contributions, so one vectorized pass scores every
+    pokedex row and the best team takes the largest contributions: a partial sort without constraints,
+    a greedy pass with them (the legendary cap is a partition matroid, so greedy is still optimal).
+    allow_duplicates=True matches the GeneticAlgorithm search space, where a row can fill several slots.
+    min_capture_rate drops rows harder to catch than that, max_legendary caps the legendary members."""
+    oponent = oponent_team.indices() if isinstance(oponent_team, TeamIndividual) else np.asarray(oponent_team)
+    contributions = data.evaluator.pokemon_contributions(oponent)
+
+    candidates = np.arange(len(contributions))
+    if min_capture_rate is not None:
+        candidates = candidates[data.pokedex_store.capture_rate[candidates] >= min_capture_rate]
+    if len(candidates) == 0:
+        raise ValueError("no pokemon satisfies the constraints")
+
+    if max_legendary is None and not allow_duplicates:
+        top = min(team_size, len(candidates))
+        best = candidates[np.argpartition(-contributions[candidates], top - 1)[:top]]
+        team = best[np.argsort(-contributions[best], kind="stable")].tolist()
+    elif max_legendary is None:
+        team = [int(candidates[np.argmax(contributions[candidates])])] * team_size
+    else:
+        team = []
+        legendary = 0
+        for row in candidates[np.argsort(-contributions[candidates], kind="stable")].tolist():
+            copies = team_size - len(team) if allow_duplicates else 1
+            if data.pokedex_store.legendary[row]:
+                copies = min(copies, max_legendary - legendary)
+                legendary += copies
+            team.extend([row] * copies)
+            if len(team) == team_size:
+                break
+
+    if len(team) < team_size:
+        raise ValueError(f"only {len(team)} pokemon satisfy the constraints, the team needs {team_size}")
+    team_contributions = contributions[team]
+    return BestTeam(tuple(team), float(data.evaluator.total_fitness(team_contributions)), team_contributions)
+
+class LeagueEvaluator:
+    """LeagueEvaluator class scores teams against a league of K oponent teams, shape (K, 6).
+    reduce="mean" is the mean fitness over the league and reduce="worst" the fitness of the worst matchup.
+    The (pop, 6, K, 6) pairs are never materialized: the contribution of every pokedex row against
+    every league team is gathered from data.evaluator.pair_matrix once, in chunks of memory_budget bytes,
+    and teams are then scored by adding the rows of their members, again in chunks of memory_budget.
+    Mean mode only keeps the mean contribution of each row, worst mode keeps the (len(pokedex), K)
+    table, which must fit in memory_budget too."""
+    REDUCTIONS = ("mean", "worst")
+
+    def __init__(self, oponent_teams:np.ndarray, reduce:str = "mean", memory_budget:int = 64 << 20):
+        if reduce not in self.REDUCTIONS:
+            raise ValueError(f"reduce must be one of {self.REDUCTIONS}, got {reduce!r}")
+        self.oponent_teams = np.asarray(oponent_teams, dtype=np.intp)
+        if self.oponent_teams.ndim != 2 or len(self.oponent_teams) == 0:
+            raise ValueError("oponent_teams must be a non empty (K, team size) array of pokedex rows")
+        self.reduce = reduce
+        self.memory_budget = memory_budget
+        self.key = ("league", reduce, self.oponent_teams.shape, hash(self.oponent_teams.tobytes()))
+
+        pair_matrix = data.evaluator.pair_matrix()
+        size, oponent_size = len(pair_matrix), self.oponent_teams.shape[1]
+        itemsize = pair_matrix.itemsize
+        if reduce == "worst" and size * len(self) * itemsize > memory_budget:
+            raise ValueError(f"a worst mode league of {len(self)} teams needs {size * len(self) * itemsize} bytes, "
+                             f"more than the memory_budget of {memory_budget}")
+
+        # contributions[row, k] = contribution of the pokedex row against the league team k,
+        # the same sequential sum as slot_fitness, so a league of one team scores exactly like the GA
+        if reduce == "mean":
+            # the mean over the league is linear, every slot keeps its mean contribution
+            total = np.zeros(size)
+        else:
+            self.contributions = np.empty((size, len(self)))
+        step = max(1, memory_budget // (2 * size * oponent_size * itemsize))
+        for start in range(0, len(self), step):
+            league = self.oponent_teams[start:start + step]
+            contributions = data.evaluator.slot_fitness(pair_matrix[:, league])
+            if reduce == "mean":
+                total += contributions.sum(axis=1)
+            else:
+                self.contributions[:, start:start + step] = contributions
+        if reduce == "mean":
+            self.contributions = total / len(self)
+
+    @classmethod
+    def random(cls, size:int, rng:np.random.Generator = None, team_size:int = 6, **kwargs) -> "LeagueEvaluator":
+        """Returns a league of size random oponent teams."""
+        return cls(data.pokedex_store.sample((size, team_size), rng), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.oponent_teams)
+
+    def pair_count(self, teams:np.ndarray) -> int:
+        """Returns the individual vs oponent pairs a batch of teams is scored on."""
+        return int(np.size(teams)) * self.oponent_teams.size
+
+    def evaluate(self, teams:np.ndarray) -> tuple:
+        """Returns the (pop, 6) slot contributions and the (pop,) league fitness of a (pop, 6) array of teams.
+        In worst mode the contributions are the ones of the worst matchup, they add up to the fitness."""
+        teams = np.asarray(teams, dtype=np.intp)
+        if self.reduce == "mean":
+            contributions = self.contributions[teams]
+            return contributions, data.evaluator.total_fitness(contributions)
+
+        contributions = np.empty(teams.shape)
+        fitness = np.empty(len(teams))
+        step = max(1, self.memory_budget // (2 * len(self) * contributions.itemsize))
+        for start in range(0, len(teams), step):
+            chunk = teams[start:start + step]
+            # (rows, K) fitness against every league team, summed slot by slot like total_fitness
+            scores = self.contributions[chunk[:, 0]]
+            for slot in range(1, teams.shape[1]):
+                scores += self.contributions[chunk[:, slot]]
+            worst = np.argmin(scores, axis=1)
+            contributions[start:start + step] = self.contributions[chunk, worst[:, None]]
+            fitness[start:start + step] = scores[np.arange(len(chunk)), worst]
+        return contributions, fitness
+
+    def bound(self, team_size:int = 6) -> float:
+        """Returns an upper bound of the league fitness of any team, exact in mean mode.
+        The worst matchup is never better than the mean, so the mean optimum bounds both reductions."""
+        contributions = self.contributions if self.reduce == "mean" else self.contributions.mean(axis=1)
+        return float(data.evaluator.total_fitness(np.full(team_size, contributions.max())))
+
+class FitnessCache:
+    """FitnessCache class is a size bounded LRU cache for fitness values.
+    Counts hits, misses and evictions so long runs can show what the cache saves."""
+    def __init__(self, max_size:int = 100_000):
+        self.max_size = max_size
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Returns the cached value of key (marking it as recently used) or default."""
+        try:
+            value = self.data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value) -> None:
+        """Stores value under key, evicting the least recently used entry when full."""
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.max_size:
+            self.data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self.data.clear()
+
+    def stats(self) -> dict:
+        """Returns the cache counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self.data)
 
 class Individual:
-    """Individual class represents a single individual in the population."""
-    def __init__(self):
-        self.pokedex_number = 0
-        self.name = "teste"
-        self.type1 = random.choice(['A', 'B', 'C'])
-        self.type2 = random.choice(['A', 'B', 'C', None])
-        self.hp = random.randint(50, 100)
-        self.attack = random.randint(10, 20)
-        self.defense = random.randint(5, 15)
-        self.speed = random.randint(1, 10)
-
-        self.capure_rate = random.randint(1, 100)
+    """Individual class represents a single individual in the population.
+    Only the pokedex row index is stored, the attributes are read from data.pokedex_store."""
+    __slots__ = ("index",)
+
+    def __init__(self, index:int = None):
+        self.index = index # row of the pokedex, set by get_pokemon
 
     def get_pokemon(self):
         """Gets a random pokemon from the pokedex."""
-        pokemon = pokedex.sample().to_dict(orient='records')[0]
+        self.index = int(data.pokedex_store.sample())
 
-        if pokemon["type2"] == "NULL":
-            type2 = None
-        else:
-            type2 = pokemon["type2"]
-
-        self.pokedex_number = pokemon["pokedex_number"]
-        self.name = pokemon["name"]
-        self.type1 = pokemon["type1"]
-        self.type2 = type2
-        self.hp = pokemon["hp"]
-        self.attack = pokemon["attack_total"]
-        self.defense = pokemon["defense_total"]
-        self.speed = pokemon["speed"]
-        self.capure_rate = pokemon["capture_rate"]
+    @property
+    def pokedex_number(self) -> int:
+        return np.int64(data.pokedex_store.pokedex_number[self.index])
+
+    @property
+    def name(self) -> str:
+        return str(data.pokedex_store.names[self.index])
+
+    @property
+    def type1(self) -> str:
+        return data.pokedex_store.type_name(data.pokedex_store.type1[self.index])
+
+    @property
+    def type2(self) -> str:
+        return data.pokedex_store.type_name(data.pokedex_store.type2[self.index])
+
+    @property
+    def hp(self) -> int:
+        return np.int64(data.pokedex_store.hp[self.index])
+
+    @property
+    def attack(self) -> int:
+        return np.int64(data.pokedex_store.attack_total[self.index])
+
+    @property
+    def defense(self) -> int:
+        return np.int64(data.pokedex_store.defense_total[self.index])
+
+    @property
+    def speed(self) -> int:
+        return np.int64(data.pokedex_store.speed[self.index])
+
+    @property
+    def capure_rate(self) -> int:
+        return np.int64(data.pokedex_store.capture_rate[self.index])
 
     def __repr__(self):
         return f"Individual(pokedex_number={self.pokedex_number}, name={self.name}, type1={self.type1}, type2={self.type2})"
@@ -52,35 +407,227 @@ class TeamIndividual:
         self.team = team
         self.fitness = 0
         self.fitness_list = []
+        self.contributions = None # (6,) fitness of each slot against the oponent team
+        self.scored_against = None # key of the oponent team the scores refer to
 
-    def initialize_random_team(self, quantity:int = 6) -> None:
+    def set_scores(self, fitness:float, fitness_list:np.ndarray, contributions:np.ndarray, oponent_key:tuple) -> None:
+        """Sets the team scores against the oponent team identified by oponent_key."""
+        self.fitness = fitness
+        self.fitness_list = fitness_list
+        self.contributions = contributions
+        self.scored_against = oponent_key
+
+    def initialize_random_team(self, quantity:int = 6, rng:np.random.Generator = None) -> None:
         """Initializes a random team of 6 individuals."""
-        self.team = []
-        for _ in range(quantity):
-            pokemon = Individual()
-            pokemon.get_pokemon()
-            self.team.append(pokemon)
+        self.team = [Individual(index) for index in data.pokedex_store.sample(quantity, rng).tolist()]
+
+    def indices(self) -> np.ndarray:
+        """Returns the pokedex row indices of the team."""
+        return np.array([individual.index for individual in self.team])
+
+    def key(self) -> tuple:
+        """Returns the team composition as a tuple of pokedex row indices, used as cache key.
+        Rows are used instead of pokedex_number because alternate forms share the same number."""
+        return tuple(individual.index for individual in self.team)
 
     def __repr__(self):
         return f"TeamIndividual(team={self.team}, fitness={self.fitness})"
 
 
+GenerationRecord = namedtuple("GenerationRecord", [
+    "generation", "fitness", "mean_fitness", "std_fitness", "diversity", "pair_evaluations",
+    "selection_seconds", "reproduction_seconds", "evaluation_seconds", "team",
+])
+GenerationRecord.__doc__ = """Compact summary of one generation.
+fitness is the fittest team fitness and team its pokedex rows, diversity the fraction
+of distinct team compositions and pair_evaluations the individual vs oponent pairs scored."""
+
+class GenerationObserver:
+    """GenerationObserver class is notified by GeneticAlgorithm.run after every generation.
+    Plain callables taking a GenerationRecord can be used as observers too."""
+    def on_generation(self, record:GenerationRecord) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+class RingBufferObserver(GenerationObserver):
+    """RingBufferObserver class keeps the last capacity records in memory."""
+    def __init__(self, capacity:int = 1000):
+        self.records = deque(maxlen=capacity)
+
+    def on_generation(self, record:GenerationRecord) -> None:
+        self.records.append(record)
+
+class JsonLinesObserver(GenerationObserver):
+    """JsonLinesObserver class appends each record as one JSON line to a file."""
+    def __init__(self, path:str):
+        self.file = open(path, "a", encoding="utf-8")
+
+    def on_generation(self, record:GenerationRecord) -> None:
+        self.file.write(json.dumps(record._asdict()) + "\n")
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class StoppingCriteria:
+    """StoppingCriteria class ends GeneticAlgorithm.run before max_generations, every criterion is optional:
+    stall_generations in a row without improving the best fitness by more than tolerance, target_fitness reached,
+    max_seconds of wall clock since the run started and max_evaluations individual vs oponent pairs scored.
+    check takes each GenerationRecord and returns the reason to stop, one of REASONS, or None."""
+    REASONS = ("target", "stall", "evaluations", "time")
+
+    def __init__(self, stall_generations:int = None, target_fitness:float = None, max_seconds:float = None,
+                 max_evaluations:int = None, tolerance:float = 0.0):
+        self.stall_generations = stall_generations
+        self.target_fitness = target_fitness
+        self.max_seconds = max_seconds
+        self.max_evaluations = max_evaluations
+        self.tolerance = tolerance
+        self.start()
+
+    def start(self) -> None:
+        """Resets the counters, called when a run starts."""
+        self.started = time.perf_counter()
+        self.best = None
+        self.stalled = 0 # generations since the last improvement
+        self.evaluations = 0
+
+    def check(self, record:GenerationRecord) -> str:
+        """Returns why the run should stop after this generation, None to go on."""
+        self.evaluations += record.pair_evaluations
+        if self.best is None or record.fitness > self.best + self.tolerance:
+            self.best = record.fitness
+            self.stalled = 0
+        else:
+            self.best = max(self.best, record.fitness)
+            self.stalled += 1
+
+        if self.target_fitness is not None and self.best >= self.target_fitness:
+            return "target"
+        if self.stall_generations is not None and self.stalled >= self.stall_generations:
+            return "stall"
+        if self.max_evaluations is not None and self.evaluations >= self.max_evaluations:
+            return "evaluations"
+        if self.max_seconds is not None and time.perf_counter() - self.started >= self.max_seconds:
+            return "time"
+        return None
+
+class AdaptiveMutation:
+    """AdaptiveMutation class raises the mutation rate of GeneticAlgorithm.run while the population lacks diversity.
+    At or above target_diversity the base rate of the run is used, below it the rate grows linearly
+    up to max_rate at zero diversity. measure is "compositions" (GenerationRecord.diversity, the
+    fraction of distinct teams) or "entropy" (GeneticAlgorithm.gene_entropy), both in [0, 1]."""
+    MEASURES = ("compositions", "entropy")
+
+    def __init__(self, target_diversity:float = 0.5, max_rate:float = 0.5, measure:str = "compositions"):
+        if measure not in self.MEASURES:
+            raise ValueError(f"measure must be one of {self.MEASURES}, got {measure!r}")
+        self.target_diversity = target_diversity
+        self.max_rate = max_rate
+        self.measure = measure
+
+    def rate(self, diversity:float, base_rate:float) -> float:
+        """Returns the mutation rate for a population with the given diversity."""
+        if diversity >= self.target_diversity:
+            return base_rate
+        return base_rate + (self.max_rate - base_rate) * (1 - diversity / self.target_diversity)
+
+
 class GeneticAlgorithm:
     """GeneticAlgorithm class represents the genetic algorithm.
     Used to find the best team (comination of individuals) to beat the oponent team."""
-    def __init__(self, population_size:int = 20, tournament_size:int = 0, oponent_team:TeamIndividual = None):
+    def __init__(self, population_size:int = 20, tournament_size:int = 0, oponent_team:TeamIndividual = None,
+                 cache_size:int = 100_000, workers:int = 1, parallel_threshold:int = 4096, seed:int = None,
+                 verify_delta:bool = False, observers:list = None, verbose:bool = True,
+                 league:LeagueEvaluator = None, mp_context=None):
+        """workers > 1 shards the population evaluation across a process pool,
+        only when a generation has at least parallel_threshold teams to evaluate.
+        seed makes the run reproducible, every random draw uses self.random or self.rng.
+        verify_delta recomputes every incrementally scored child from scratch and raises on any difference.
+        observers are notified with a GenerationRecord after every generation, verbose prints one line per generation.
+        league replaces the single oponent team: the fitness is scored against every team of the league.
+        mp_context is the multiprocessing context of the process pool, the default start method if None."""
         self.population_size = population_size
         self.tournament_size = tournament_size
         self.population = [] # list of TeamIndividual
         self.oponent_team = oponent_team # a TeamIndividual
         self.global_gen_fitness = 0
-        self.historical_fitness = []
+        self.population_fitness = np.zeros(0) # fitness of the current population
+        self.cumulative_fitness = np.zeros(0) # prefix sum of the current population fitness
+        self.historical_fitness = [] # list of GenerationRecord
         self.fittest_team = 0
 
+        # team fitness keyed by (team composition, oponent composition)
+        self.team_cache = FitnessCache(cache_size)
+        # pair fitness keyed by (individual row, oponent individual row)
+        self.pair_cache = FitnessCache(len(data.pokedex_store) * 6)
+
+        self.random = random.Random(seed)
+        self.rng = np.random.default_rng(seed)
+
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
+        self.executor = None
+        self.mp_context = mp_context
+
+        self.verify_delta = verify_delta
+
+        self.observers = list(observers or [])
+        self.verbose = verbose
+        self.pair_evaluations = 0 # individual vs oponent pairs scored so far
+        self.evaluation_seconds = 0.0 # time spent scoring teams so far
+        self.batch_duplicates = 0 # teams scored with a same composition of their batch, not through the cache
+        self.bound = None # fitness of the best_response to the oponent team, set by run(stop_at_bound=True)
+        self.mutation_rate = None # mutation rate of the last generation, changes with an AdaptiveMutation
+        self.stop_reason = None # why the last run stopped, see run
+        self.league = league
+
+    def close(self) -> None:
+        """Shuts down the evaluation process pool, if any."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def evaluate_teams(self, teams:np.ndarray) -> np.ndarray:
+        """Returns the (n, k, 6) pair fitness of a (n, k) array of teams (or team slots) against the oponent team.
+        Large batches are split in one shard per worker and evaluated in the process pool."""
+        oponent_team = self.oponent_team.indices()
+        if self.workers <= 1 or len(teams) < self.parallel_threshold:
+            return data.evaluator.pair_fitness(teams, oponent_team)
+
+        if self.executor is None:
+            # every worker memory maps the binary cache instead of receiving a pickled evaluator
+            self.executor = process_pool.executor(sys.modules[__name__], self.workers, "_init_worker", self.mp_context)
+        shards = np.array_split(teams, self.workers)
+        return np.concatenate(list(self.executor.map(_evaluate_shard, shards, [oponent_team] * len(shards))))
+
+    def cache_stats(self) -> dict:
+        """Returns the hit/miss/eviction counters of the team and pair fitness caches
+        and the batch_duplicates, teams that shared the evaluation of a same composition.
+        The pair cache only serves calculate_team_fitness, run scores whole batches with the evaluator."""
+        return {"team": self.team_cache.stats(), "pair": self.pair_cache.stats(), "batch_duplicates": self.batch_duplicates}
+
+    def oponent_key(self) -> tuple:
+        """Returns the key of what the teams are scored against, the league or the oponent team."""
+        return self.league.key if self.league is not None else self.oponent_team.key()
+
     def initialize_oponent_team(self) -> None:
         """Initializes a random oponent team."""
         self.oponent_team = TeamIndividual()
-        self.oponent_team.initialize_random_team(6)
+        self.oponent_team.initialize_random_team(6, self.rng)
 
     def best_team(self, team:TeamIndividual) -> None:
         """Updates the fittest team if the team passed as argument is fitter."""
@@ -93,72 +640,176 @@ class GeneticAlgorithm:
         return fittest_team
 
     def attack_multiplier(self, individual:Individual, oponent_individual:Individual) -> float:
-        """Calculates the attack multiplier of an individual based on his oponent individual."""
-        # 2x2 matrix with the types attack multipliers
-        # 2x6 matrix with the types of the individuals
-        # 2x6 transpose matrix with the types of the oponent individuals, vector now
-        # mulipliers = {
-        #     'A': {'A': 1, 'B': 2, 'C': 0.5},
-        #     'B': {'A': 0.5, 'B': 1, 'C': 2},
-        #     'C': {'A': 2, 'B': 0.5, 'C': 1}
-        # }
-
-
-        attack_multiplier1 = df_matriz.set_index("tipo")[f"{oponent_individual.type1}"].to_dict()[f"{individual.type1}"]
-
-        if oponent_individual.type2 == None: # in case oponent_individual has only one type
-            attack_multiplier2 = 1
-        else:
-            attack_multiplier2 = df_matriz.set_index("tipo")[f"{oponent_individual.type2}"].to_dict()[f"{individual.type1}"]
-
-        if individual.type2 == None: # in case individual has only one type
-            attack_multiplier3 = 1
-        else:
-            attack_multiplier3 = df_matriz.set_index("tipo")[f"{oponent_individual.type1}"].to_dict()[f"{individual.type2}"]
-
-        if individual.type2 != None and oponent_individual.type2 != None: # in case both individuals has two types
-            attack_multiplier4 = df_matriz.set_index("tipo")[f"{oponent_individual.type2}"].to_dict()[f"{individual.type2}"]
-        else:
-            attack_multiplier4 = 1
-
-        attack_multiplier = attack_multiplier1 * attack_multiplier2 * attack_multiplier3 * attack_multiplier4
-
-        return attack_multiplier
+        """Calculates the attack multiplier of an individual based on his oponent individual.
+        Uses the precomputed type_chart, a single lookup per pair."""
+        return float(data.type_chart.multiplier(
+            data.pokedex_store.type1[individual.index], data.pokedex_store.type2[individual.index],
+            data.pokedex_store.type1[oponent_individual.index], data.pokedex_store.type2[oponent_individual.index]))
 
     def calculate_fitness_individual(self, individual:Individual, oponent_individual:Individual) -> float:
         """Calculates the fitness of an individual based on his oponent individual."""
+        key = (individual.index, oponent_individual.index)
+        fitness = self.pair_cache.get(key)
+        if fitness is not None:
+            return fitness
 
         attack_multiplier = self.attack_multiplier(individual, oponent_individual)
 
         hp_coef = individual.hp / oponent_individual.hp
         speed_coef = individual.speed / oponent_individual.speed # proability of attacking or the attacking rate
 
-        fitness = hp_coef + ((individual.attack/oponent_individual.defense) * attack_multiplier) * speed_coef
+        fitness = float(hp_coef + ((individual.attack/oponent_individual.defense) * attack_multiplier) * speed_coef)
 
+        self.pair_cache.put(key, fitness)
         return fitness
 
     def calculate_team_fitness(self, team:TeamIndividual) -> float:
         """Calculates the fitness of a team based on his oponent team."""
         # code for calculating fitness of a team based on his opponents team
-        # fitness = sum of fitness of each individual
+        # fitness = sum of the contribution of each individual,
+        # contribution = sum of the individual fitness against each oponent
+        oponent_key = self.oponent_team.key()
+        key = (team.key(), oponent_key)
+        cached = self.team_cache.get(key)
+        if cached is not None:
+            team.set_scores(*cached, oponent_key)
+            return team.fitness
+
+        team_fitness = 0
+        fitness_list = []
+        contributions = []
         for individual in team.team:
             fitness_list_temp = []
-            fitness = 0
+            contribution = 0
             for oponent_individual in self.oponent_team.team:
                 fitness = self.calculate_fitness_individual(individual, oponent_individual)
                 fitness_list_temp.append(fitness)
-                team.fitness += fitness
-            team.fitness_list.append(fitness_list_temp)
+                contribution += fitness
+            fitness_list.append(fitness_list_temp)
+            contributions.append(contribution)
+            team_fitness += contribution
+
+        team.set_scores(team_fitness, np.array(fitness_list), np.array(contributions), oponent_key)
+        self.team_cache.put(key, (team.fitness, team.fitness_list, team.contributions))
         return team.fitness
 
     def calculate_population_fitness(self) -> None:
-        """Calculates the fitness of each team in the population."""
+        """Calculates the fitness of each team in the population.
+        Teams already scored against the current oponent (children built by
+        reproduce) are kept, teams in the team cache are filled from it, the
+        remaining distinct compositions are evaluated at once by the evaluator and
+        team.fitness and team.fitness_list are filled from the (pop, 6, 6) result."""
+        if not self.population:
+            return
+        oponent_key = self.oponent_key()
+
+        pending = {} # team key -> teams waiting for that composition
         for team in self.population:
-            self.calculate_team_fitness(team)
+            if team.scored_against == oponent_key:
+                continue
+            key = team.key()
+            if key in pending: # repeated composition in this generation, computed once
+                self.batch_duplicates += 1
+                pending[key].append(team)
+                continue
+            cached = self.team_cache.get((key, oponent_key))
+            if cached is None:
+                pending[key] = [team]
+            else:
+                team.set_scores(*cached, oponent_key)
+
+        if not pending:
+            return
+
+        start = time.perf_counter()
+        if self.league is None:
+            pair_fitness = self.evaluate_teams(np.array(list(pending)))
+            contributions = data.evaluator.slot_fitness(pair_fitness)
+            fitness = data.evaluator.total_fitness(contributions)
+            pair_evaluations = pair_fitness.size
+        else:
+            # league teams keep no pair fitness, only their slot contributions
+            contributions, fitness = self.league.evaluate(np.array(list(pending)))
+            pair_fitness = [None] * len(fitness)
+            pair_evaluations = self.league.pair_count(contributions)
+
+        for key, teams, team_fitness, fitness_list, contribution in zip(
+                pending, pending.values(), fitness.tolist(), pair_fitness, contributions):
+            # copies, a row view would keep the whole batch alive in the cache
+            fitness_list = None if fitness_list is None else fitness_list.copy()
+            scores = (team_fitness, fitness_list, contribution.copy())
+            self.team_cache.put((key, oponent_key), scores)
+            for team in teams:
+                team.set_scores(*scores, oponent_key)
+        self.pair_evaluations += pair_evaluations
+        self.evaluation_seconds += time.perf_counter() - start
+
+    def score_children(self, children:list) -> None:
+        """Scores children built by reproduce incrementally.
+        Each child is a (child, parent1, parent2, crosspoint, changed slots) tuple.
+        When both parents are scored against the current oponent, the child takes
+        their slot contributions and only the mutated slots are evaluated, all
+        children in one batch. The total is rebuilt from the contributions with the
+        same slot by slot sum as a full recompute, so the result is exactly equal.
+        Children whose composition is in the team cache are filled from it, the
+        others are stored in it once scored.
+        In league mode the children are left to calculate_population_fitness,
+        the worst matchup of a child is not the one of its parents."""
+        if self.league is not None:
+            return
+        oponent_key = self.oponent_team.key()
+        delta_children = []
+        rescore = [] # (child, slot) pairs to evaluate
+        for child, parent1, parent2, crosspoint, changed in children:
+            if parent1.scored_against != oponent_key or parent2.scored_against != oponent_key:
+                continue # scored from scratch by calculate_population_fitness
+            cached = self.team_cache.get((child.key(), oponent_key))
+            if cached is not None:
+                child.set_scores(*cached, oponent_key)
+                continue
+            child.fitness_list = np.concatenate((parent1.fitness_list[:crosspoint], parent2.fitness_list[crosspoint:]))
+            child.contributions = np.concatenate((parent1.contributions[:crosspoint], parent2.contributions[crosspoint:]))
+            child.scored_against = oponent_key
+            delta_children.append(child)
+            rescore.extend((child, slot) for slot in changed)
+
+        if rescore:
+            start = time.perf_counter()
+            slots = np.array([[child.team[slot].index] for child, slot in rescore])
+            pair_fitness = self.evaluate_teams(slots)[:, 0, :]
+            contributions = data.evaluator.slot_fitness(pair_fitness)
+            for (child, slot), fitness_list, contribution in zip(rescore, pair_fitness, contributions):
+                child.fitness_list[slot] = fitness_list
+                child.contributions[slot] = contribution
+            self.pair_evaluations += pair_fitness.size
+            self.evaluation_seconds += time.perf_counter() - start
+
+        if not delta_children:
+            return
+        fitness = data.evaluator.total_fitness(np.array([child.contributions for child in delta_children]))
+        for child, child_fitness in zip(delta_children, fitness.tolist()):
+            child.fitness = child_fitness
+            self.team_cache.put((child.key(), oponent_key), (child.fitness, child.fitness_list, child.contributions))
+
+        if self.verify_delta:
+            self.check_delta(delta_children)
+
+    def check_delta(self, teams:list) -> None:
+        """Recomputes teams from scratch and raises if the incremental scores differ."""
+        pair_fitness = data.evaluator.pair_fitness(np.array([team.key() for team in teams]), self.oponent_team.indices())
+        contributions = data.evaluator.slot_fitness(pair_fitness)
+        fitness = data.evaluator.total_fitness(contributions)
+        for team, team_fitness, fitness_list, contribution in zip(teams, fitness.tolist(), pair_fitness, contributions):
+            if (team.fitness != team_fitness or not np.array_equal(team.fitness_list, fitness_list)
+                    or not np.array_equal(team.contributions, contribution)):
+                raise RuntimeError(f"incremental fitness {team.fitness} differs from full recompute {team_fitness} for {team.key()}")
 
     def calculate_global_fitness(self) -> None:
-        for team in self.population:
-            self.global_gen_fitness += team.fitness
+        """Calculates the global fitness of the current generation and its cumulative distribution.
+        Both are recomputed every generation, used by the roulette wheel selection."""
+        self.population_fitness = np.array([team.fitness for team in self.population], dtype=float)
+        self.cumulative_fitness = np.cumsum(self.population_fitness)
+        self.global_gen_fitness = float(self.cumulative_fitness[-1]) if len(self.cumulative_fitness) else 0
 
     def sort_population(self):
         self.population = sorted(self.population, key = lambda x:x.fitness)
@@ -166,56 +817,98 @@ class GeneticAlgorithm:
     def initialize_population(self) -> None:
         """Initializes a random population."""
         fittest_team = None
-        for _ in range(self.population_size):
-            team = None
-            team = TeamIndividual()
-            team.initialize_random_team(6)
-            self.population.append(team)
+        pair_evaluations, evaluation_seconds = self.pair_evaluations, self.evaluation_seconds
+        # one rng call for the whole population
+        for indices in data.pokedex_store.sample((self.population_size, 6), self.rng).tolist():
+            self.population.append(TeamIndividual([Individual(index) for index in indices]))
         self.calculate_population_fitness()
         self.calculate_global_fitness()
         fittest_team = self.best_team_population(self.population)
-        self.historical_fitness.append(fittest_team)
         # not using self.best_team because in the first generation 
         # all teams could have negative fitness and the fittest team 
         # would be 0 in that way could break the logic on future generations
         self.fittest_team = fittest_team # self.best_team(fittest_team)
-        print(f"Generation 0: Fittest individual has fitness {fittest_team.fitness}")
+        self.record_generation(0, fittest_team, self.pair_evaluations - pair_evaluations,
+                               0.0, 0.0, self.evaluation_seconds - evaluation_seconds)
+
+    def diversity(self) -> float:
+        """Returns the fraction of distinct team compositions in the population."""
+        return len({team.key() for team in self.population}) / len(self.population)
+
+    def gene_entropy(self) -> float:
+        """Returns the entropy of the pokedex rows in each team slot, averaged over the slots and
+        normalized to [0, 1]: 0 when every team has the same member in every slot."""
+        if len(self.population) < 2:
+            return 0.0
+        teams = np.array([team.key() for team in self.population])
+        entropy = 0.0
+        for slot in teams.T:
+            probability = np.unique(slot, return_counts=True)[1] / len(slot)
+            entropy -= float(np.dot(probability, np.log(probability)))
+        return entropy / (teams.shape[1] * np.log(min(len(teams), len(data.pokedex_store))))
+
+    def record_generation(self, generation:int, fittest_team:TeamIndividual, pair_evaluations:int,
+                          selection_seconds:float, reproduction_seconds:float, evaluation_seconds:float) -> GenerationRecord:
+        """Stores a compact record of the generation, notifies the observers and prints it if verbose."""
+        record = GenerationRecord(
+            generation=generation,
+            fitness=fittest_team.fitness,
+            mean_fitness=float(self.population_fitness.mean()),
+            std_fitness=float(self.population_fitness.std()),
+            diversity=self.diversity(),
+            pair_evaluations=pair_evaluations,
+            selection_seconds=selection_seconds,
+            reproduction_seconds=reproduction_seconds,
+            evaluation_seconds=evaluation_seconds,
+            team=fittest_team.key(),
+        )
+        self.historical_fitness.append(record)
+        for observer in self.observers:
+            getattr(observer, "on_generation", observer)(record)
+        if self.verbose:
+            print(f"Generation {generation}: Fittest individual has fitness {fittest_team.fitness}")
+        return record
 
     def roulette_wheel_selection(self) -> TeamIndividual:
         """ Selects an individual from the population using roulette wheel selection
-    The roulette_wheel_selection method calculates the selection 
-probabilities for each individual in the population based on 
-their fitness, and then uses the itertools.accumulate 
-function to calculate the cumulative probabilities. 
-It then generates a random number between 0 and 1, 
-and iterates over the cumulative probabilities until it finds 
-the index of the first individual whose cumulative probability 
-is greater than or equal to the random number. 
+    The roulette_wheel_selection method uses the cumulative fitness
+of the generation, computed once by calculate_global_fitness.
+It then generates a random number between 0 and the global fitness,
+and finds with a binary search (np.searchsorted) the index of the
+first individual whose cumulative fitness is greater than or equal
+to the random number.
 This individual is then selected for the next generation."""
+        return self.roulette_wheel_selection_batch(1)[0]
+
+    def roulette_wheel_selection_batch(self, quantity:int) -> list:
+        """Selects quantity individuals at once with roulette wheel selection, O(log n) per draw."""
         # one individual can be selected multiple times
         # because of that the same individual can be selected for crossover
         # that way in the crossover we can have the same individual as parent1 and parent2
         # resuling in the same individual as child
-        selection_probabilities = [team.fitness / self.global_gen_fitness for team in self.population]
-        cumulative_probabilities = list(itertools.accumulate(selection_probabilities))
-        random_number = random.random()
-        for i, probability in enumerate(cumulative_probabilities):
-            if random_number <= probability:
-                break
-        return self.population[i]
+        if len(self.cumulative_fitness) != len(self.population):
+            self.calculate_global_fitness()
+        random_numbers = self.rng.random(quantity) * self.global_gen_fitness
+        selected = np.searchsorted(self.cumulative_fitness, random_numbers, side="left")
+        # guards the float edge case where the random number lands past the last prefix sum
+        selected = np.minimum(selected, len(self.population) - 1)
+        return [self.population[i] for i in selected.tolist()]
 
     def tournament_selection(self) -> list:
-        """Selects individuals from the population using tournament selection"""
-        selected_individuals = []
-        for i in range(self.population_size):
-            tournament = random.sample(self.population, self.tournament_size)
-            winner = max(tournament, key=lambda x: x.fitness)
-            selected_individuals.append(winner)
-        return selected_individuals
-
-    def crossover(self, parent1:TeamIndividual, parent2:TeamIndividual) -> list:
+        """Selects individuals from the population using tournament selection.
+        All tournaments are sampled at once as a (pop, tournament_size) index matrix,
+        contestants are drawn with replacement."""
+        if self.tournament_size < 1:
+            raise ValueError("tournament_size must be at least 1 for tournament selection")
+        fitness = np.array([team.fitness for team in self.population])
+        tournaments = self.rng.integers(0, len(self.population), size=(self.population_size, self.tournament_size))
+        winners = tournaments[np.arange(len(tournaments)), np.argmax(fitness[tournaments], axis=1)]
+        return [self.population[i] for i in winners.tolist()]
+
+    def crossover(self, parent1:TeamIndividual, parent2:TeamIndividual, crosspoint:int = None) -> list:
         """Crossover method takes two parents and returns a child"""
-        crosspoint = random.randint(0, 5)
+        if crosspoint is None:
+            crosspoint = self.random.randint(0, 5)
         parent1_cut = parent1.team[:crosspoint]
         parent2_cut = parent2.team[crosspoint:]
         child = parent1_cut + parent2_cut
@@ -223,40 +916,130 @@ This individual is then selected for the next generation."""
 
     def mutation(self, team:list, mutation_rate:float = 0.1) -> list:
         """Mutation method takes an team and mutates it's individuals with a given mutation rate"""
-        mutated_team = []
-        i = 0
-        for x in team:
-            pokemon = x
-            if random.random() < mutation_rate:
-                pokemon = Individual()
-                pokemon.get_pokemon()
-            mutated_team.append(pokemon)
-            i += 0
+        mutated_team = list(team)
+        mutated = np.flatnonzero(self.rng.random(len(team)) < mutation_rate)
+        for position, index in zip(mutated.tolist(), data.pokedex_store.sample(len(mutated), self.rng).tolist()):
+            mutated_team[position] = Individual(index)
         return mutated_team
 
     def reproduce(self, selected_teams:list, mutation_rate:float = 0.1) -> list:
-        """Reproduce method takes a list of selected team's and returns a new population"""
+        """Reproduce method takes a list of selected team's and returns a new population.
+        Children are scored incrementally from their parents, see score_children."""
         new_population = []
+        children = []
         for _ in range(self.population_size):
-            parent1, parent2 = random.sample(selected_teams, 2)
-            child_team = self.crossover(parent1, parent2)
-            child_team = self.mutation(child_team, mutation_rate)
-            child = TeamIndividual(child_team)
+            parent1, parent2 = self.random.sample(selected_teams, 2)
+            crosspoint = self.random.randint(0, 5)
+            child_team = self.crossover(parent1, parent2, crosspoint)
+            mutated_team = self.mutation(child_team, mutation_rate)
+            changed = [slot for slot, (before, after) in enumerate(zip(child_team, mutated_team)) if before is not after]
+            child = TeamIndividual(mutated_team)
+            children.append((child, parent1, parent2, crosspoint, changed))
             new_population.append(child)
+        self.score_children(children)
         return new_population
 
-    def run(self, max_generations:int = 100, mutation_rate:float = 0.1) -> None:
-        """Runs the genetic algorithm"""
+    def should_stop(self, record:GenerationRecord, stopping:StoppingCriteria = None) -> str:
+        """Returns why the run should stop after the generation of record, None to go on."""
+        if self.bound is not None and self.fittest_team.fitness >= self.bound * (1 - 1e-12):
+            return "bound"
+        return stopping.check(record) if stopping is not None else None
+
+    def run(self, max_generations:int = 100, mutation_rate:float = 0.1, stop_at_bound:bool = False,
+            stopping:StoppingCriteria = None, adaptive_mutation:AdaptiveMutation = None) -> str:
+        """Runs the genetic algorithm and returns why it stopped, also kept in stop_reason:
+        "max_generations", "bound" or one of StoppingCriteria.REASONS.
+        stop_at_bound computes the exact best_response first and stops once the fittest team reaches it
+        (in league mode LeagueEvaluator.bound, only reachable with reduce="mean").
+        adaptive_mutation raises mutation_rate, every generation, while the population diversity is low."""
+        if stopping is not None:
+            stopping.start()
+        self.mutation_rate = mutation_rate
         self.initialize_oponent_team()
         self.initialize_population()
-        self.calculate_population_fitness()
+        self.bound = None
+        if stop_at_bound:
+            self.bound = best_response(self.oponent_team).fitness if self.league is None else self.league.bound()
+
+        record = self.historical_fitness[-1]
+        self.stop_reason = self.should_stop(record, stopping)
         for generation in range(1, max_generations):
-            selected_individuals = [self.roulette_wheel_selection() for _ in range(self.population_size)]
-            self.population = self.reproduce(selected_individuals, mutation_rate)
+            if self.stop_reason is not None:
+                break
+            if adaptive_mutation is not None:
+                diversity = record.diversity if adaptive_mutation.measure == "compositions" else self.gene_entropy()
+                self.mutation_rate = adaptive_mutation.rate(diversity, mutation_rate)
+            pair_evaluations, evaluation_seconds = self.pair_evaluations, self.evaluation_seconds
+
+            start = time.perf_counter()
+            selected_individuals = self.roulette_wheel_selection_batch(self.population_size)
+            selected_at = time.perf_counter()
+            self.population = self.reproduce(selected_individuals, self.mutation_rate)
+            reproduced_at = time.perf_counter()
             self.calculate_population_fitness()
             self.calculate_global_fitness()
             fittest_team = self.best_team_population(self.population)
-            self.historical_fitness.append(fittest_team)
             self.best_team(fittest_team)
+            evaluated_at = time.perf_counter()
+
+            # incremental scoring of the children happens inside reproduce, it is counted as evaluation
+            delta_seconds = self.evaluation_seconds - evaluation_seconds
+            record = self.record_generation(generation, fittest_team, self.pair_evaluations - pair_evaluations,
+                                            selected_at - start,
+                                            reproduced_at - selected_at - delta_seconds,
+                                            evaluated_at - reproduced_at + delta_seconds)
+            self.stop_reason = self.should_stop(record, stopping)
+
+        if self.stop_reason is None:
+            self.stop_reason = "max_generations"
+        elif self.verbose:
+            print(f"Generation {record.generation}: stopped ({self.stop_reason}), best fitness {self.fittest_team.fitness}")
+        return self.stop_reason
+
+
+_worker_evaluator = None
+
+def _init_worker() -> None:
+    """Process pool initializer, loads the evaluator once per worker from the binary cache."""
+    global _worker_evaluator
+    _worker_evaluator = data.evaluator
+
+def _evaluate_shard(teams:np.ndarray, oponent_team:np.ndarray) -> np.ndarray:
+    """Evaluates one shard of teams in a worker process."""
+    return _worker_evaluator.pair_fitness(teams, oponent_team)
+
+def _run_config(config:dict) -> dict:
+    """Runs one GeneticAlgorithm configuration and returns its history."""
+    config = dict(config)
+    max_generations = config.pop("max_generations", 100)
+    mutation_rate = config.pop("mutation_rate", 0.1)
+    run_options = {name: config.pop(name) for name in ("stopping", "adaptive_mutation") if name in config}
+    config.setdefault("verbose", False)
+    ga = GeneticAlgorithm(**config)
+    ga.run(max_generations=max_generations, mutation_rate=mutation_rate, **run_options)
+    return {
+        "config": {**config, "max_generations": max_generations, "mutation_rate": mutation_rate},
+        "history": [record.fitness for record in ga.historical_fitness],
+        "stop_reason": ga.stop_reason,
+        "best_fitness": ga.fittest_team.fitness,
+        "best_team": ga.fittest_team.key(),
+        "oponent_team": ga.oponent_team.key(),
+    }
 
-            print(f"Generation {generation}: Fittest individual has fitness {fittest_team.fitness}")
\ No newline at end of file
+def run_many(configs:list, workers:int = None, seed:int = None, mp_context=None) -> list:
+    """Runs independent GeneticAlgorithm runs (e.g. a mutation_rate sweep) concurrently.
+    Each config is a dict with GeneticAlgorithm arguments plus max_generations and mutation_rate,
+    and optionally the stopping and adaptive_mutation of GeneticAlgorithm.run.
+    Configs without a seed get one spawned from seed, so every run is reproducible
+    regardless of which worker executes it. Returns one history dict per config, in order.
+    mp_context is the multiprocessing context of the process pool, the default start method if None."""
+    seeds = np.random.SeedSequence(seed).spawn(len(configs))
+    configs = [
+        config if config.get("seed") is not None
+        else {**config, "seed": int(child.generate_state(1)[0])}
+        for config, child in zip(configs, seeds)
+    ]
+    if workers == 1:
+        return [_run_config(config) for config in configs]
+    with process_pool.executor(sys.modules[__name__], workers, mp_context=mp_context) as executor:
+        return list(executor.map(_run_config, configs))
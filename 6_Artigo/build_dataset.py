@@ -0,0 +1,211 @@
+"""Dataset build of 1_ga.py, the steps of 0_DataTreatment.ipynb as a graph of cached stages.
+
+    python build_dataset.py            # rebuilds what changed
+    python build_dataset.py --force    # rebuilds everything
+
+Each stage reads some files and writes others. Its key is the hash of its name,
+version and the content of its inputs, recorded with the hashes of its outputs in
+data/.cache/build.json. A stage runs again only when its key changes or an output
+is missing or was edited, so a stage whose rebuilt inputs come out byte for byte
+the same is skipped too. The last stages write the typed column cache of
+pokedex_data, which 1_ga.py memory maps without parsing any CSV."""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import zipfile
+from collections import namedtuple
+from xml.etree import ElementTree
+import numpy as np
+import pokedex_data
+
+Stage = namedtuple("Stage", ["name", "version", "inputs", "outputs", "run"])
+Stage.__doc__ = """One build step: inputs and outputs are paths relative to the data directory,
+run(data_dir) writes the outputs. Bump version when run changes its result."""
+
+# "½×" strings of the tratada sheet of matriz_tipo.xlsx
+MULTIPLIERS = {"0×": 0.0, "½×": 0.5, "1×": 1.0, "2×": 2.0}
+
+SPREADSHEET = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+RELATIONSHIPS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+def write_csv(path:str, header:list, rows:list) -> None:
+    """Writes a CSV like pandas to_csv(index=False), through a temporary file."""
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(rows)
+    os.replace(temporary, path)
+
+def column_index(reference:str) -> int:
+    """Returns the 0 based column of a cell reference such as "AB12"."""
+    index = 0
+    for letter in reference:
+        if not letter.isalpha():
+            break
+        index = index * 26 + ord(letter.upper()) - ord("A") + 1
+    return index - 1
+
+def read_xlsx_sheet(path:str, sheet:str) -> list:
+    """Returns the rows of a sheet of an xlsx file as lists of strings (None for empty cells).
+    Only the cell values are read, with the standard library instead of pandas and openpyxl."""
+    with zipfile.ZipFile(path) as book:
+        workbook = ElementTree.fromstring(book.read("xl/workbook.xml"))
+        relationships = ElementTree.fromstring(book.read("xl/_rels/workbook.xml.rels"))
+        targets = {rel.get("Id"): rel.get("Target") for rel in relationships}
+        sheets = {item.get("name"): targets[item.get(RELATIONSHIPS + "id")] for item in workbook.iter(SPREADSHEET + "sheet")}
+        if sheet not in sheets:
+            raise ValueError(f"{path} has no sheet {sheet!r}, only {sorted(sheets)}")
+
+        shared = []
+        if "xl/sharedStrings.xml" in book.namelist():
+            strings = ElementTree.fromstring(book.read("xl/sharedStrings.xml"))
+            shared = ["".join(text.text or "" for text in item.iter(SPREADSHEET + "t")) for item in strings]
+
+        worksheet = ElementTree.fromstring(book.read("xl/" + sheets[sheet].lstrip("/").removeprefix("xl/")))
+        rows = []
+        for row in worksheet.iter(SPREADSHEET + "row"):
+            values = []
+            for cell in row.iter(SPREADSHEET + "c"):
+                column = column_index(cell.get("r"))
+                values.extend([None] * (column - len(values)))
+                kind, value = cell.get("t"), cell.find(SPREADSHEET + "v")
+                if kind == "inlineStr":
+                    values.append("".join(text.text or "" for text in cell.iter(SPREADSHEET + "t")))
+                elif value is None:
+                    values.append(None)
+                elif kind == "s":
+                    values.append(shared[int(value.text)])
+                else:
+                    values.append(value.text)
+            rows.append(values)
+        return rows
+
+def merge_pokedex(data_dir:str) -> None:
+    """pokemon.csv without Mega forms, merged with the capture_rate of pokemon_kaggle.csv.
+    Like the notebook, every name containing "Mega" is dropped (Meganium too), attack and
+    defense are summed with their special counterparts and the missing type2 is NULL."""
+    header, rows = pokedex_data.read_csv(os.path.join(data_dir, "pokemon.csv"))
+    kaggle_header, kaggle_rows = pokedex_data.read_csv(os.path.join(data_dir, "pokemon_kaggle.csv"))
+    number, capture_rate = kaggle_header.index("pokedex_number"), kaggle_header.index("capture_rate")
+    capture_rates = {row[number]: row[capture_rate] for row in kaggle_rows}
+
+    pokedex = []
+    for row in rows:
+        pokemon = dict(zip(header, row))
+        if "Mega" in pokemon["Name"] or pokemon["#"] not in capture_rates:
+            continue
+        pokedex.append([
+            int(pokemon["#"]),
+            pokemon["Name"],
+            pokemon["Type 1"],
+            pokemon["Type 2"] or pokedex_data.NO_TYPE,
+            int(pokemon["HP"]),
+            int(pokemon["Attack"]) + int(pokemon["Sp. Atk"]),
+            int(pokemon["Defense"]) + int(pokemon["Sp. Def"]),
+            int(pokemon["Speed"]),
+            int(capture_rates[pokemon["#"]]),
+            pokemon["Legendary"],
+            int(pokemon["Generation"]),
+        ])
+    write_csv(os.path.join(data_dir, "pokemon_dataset.csv"), list(pokedex_data.POKEDEX_COLUMNS), pokedex)
+
+def convert_type_chart(data_dir:str) -> None:
+    """The tratada sheet of matriz_tipo.xlsx with its multiplier strings as floats."""
+    header, *rows = read_xlsx_sheet(os.path.join(data_dir, "matriz_tipo.xlsx"), "tratada")
+    chart = []
+    for row in rows:
+        unknown = set(row[1:]) - set(MULTIPLIERS)
+        if unknown:
+            raise ValueError(f"matriz_tipo.xlsx row {row[0]} has unknown multipliers {sorted(unknown, key=str)}")
+        chart.append([row[0]] + [MULTIPLIERS[value] for value in row[1:]])
+    write_csv(os.path.join(data_dir, "matriz_tipo.csv"), header, chart)
+
+def cache_type_chart(data_dir:str) -> None:
+    """Type names and the float32 type matrix in the column cache."""
+    types, type_matrix = pokedex_data.parse_type_chart(os.path.join(data_dir, "matriz_tipo.csv"))
+    cache_dir = os.path.join(data_dir, ".cache")
+    pokedex_data.write_column(cache_dir, "types", np.array(types, dtype=str))
+    pokedex_data.write_column(cache_dir, "type_matrix", type_matrix)
+
+def cache_pokedex(data_dir:str) -> None:
+    """Pokedex columns in the column cache, types as codes of the cached type names."""
+    cache_dir = os.path.join(data_dir, ".cache")
+    types = np.load(os.path.join(cache_dir, "types.npy"), allow_pickle=False).tolist()
+    columns = pokedex_data.parse_pokedex(os.path.join(data_dir, "pokemon_dataset.csv"), types)
+    for name, values in columns.items():
+        pokedex_data.write_column(cache_dir, name, values)
+
+STAGES = [
+    Stage("pokedex", 1, ["pokemon.csv", "pokemon_kaggle.csv"], ["pokemon_dataset.csv"], merge_pokedex),
+    Stage("type_chart", 1, ["matriz_tipo.xlsx"], ["matriz_tipo.csv"], convert_type_chart),
+    Stage("type_chart_cache", 1, ["matriz_tipo.csv"], [".cache/types.npy", ".cache/type_matrix.npy"], cache_type_chart),
+    # depends on the type names only, a multiplier edit does not rebuild the pokedex columns
+    Stage("pokedex_cache", 1, ["pokemon_dataset.csv", ".cache/types.npy"],
+          [f".cache/{name}.npy" for name in pokedex_data.POKEDEX_COLUMNS], cache_pokedex),
+]
+
+def stage_key(stage:Stage, data_dir:str) -> str:
+    """Returns the hash of the stage name, version and input contents."""
+    digest = hashlib.sha256(f"{stage.name}:{stage.version}".encode())
+    for path in stage.inputs:
+        digest.update(f"\0{path}\0{pokedex_data.file_hash(os.path.join(data_dir, path))}".encode())
+    return digest.hexdigest()
+
+def output_hashes(stage:Stage, data_dir:str) -> dict:
+    """Returns the hashes of the stage outputs, None for the missing ones."""
+    return {
+        path: pokedex_data.file_hash(os.path.join(data_dir, path)) if os.path.exists(os.path.join(data_dir, path)) else None
+        for path in stage.outputs
+    }
+
+def build(data_dir:str = pokedex_data.DATA_DIR, force:bool = False, verbose:bool = True) -> dict:
+    """Runs the stages that are out of date, in order, and returns stage name -> "built" or "skipped".
+    The pokedex_data manifest is rewritten when any cached column changed, so 1_ga.py picks up the new cache."""
+    cache_dir = os.path.join(data_dir, ".cache")
+    manifest_path = os.path.join(cache_dir, "build.json")
+    try:
+        with open(manifest_path, encoding="utf-8") as file:
+            recorded = json.load(file)["stages"]
+    except (OSError, ValueError, KeyError):
+        recorded = {}
+
+    status = {}
+    stages = {}
+    for stage in STAGES:
+        key = stage_key(stage, data_dir)
+        previous = recorded.get(stage.name, {})
+        outputs = output_hashes(stage, data_dir)
+        if force or previous.get("key") != key or previous.get("outputs") != outputs or None in outputs.values():
+            if any(path.startswith(".cache/") for path in stage.outputs):
+                pokedex_data.remove_manifest(cache_dir)
+            stage.run(data_dir)
+            outputs = output_hashes(stage, data_dir)
+            status[stage.name] = "built"
+        else:
+            status[stage.name] = "skipped"
+        stages[stage.name] = {"key": key, "version": stage.version, "inputs": stage.inputs, "outputs": outputs}
+        if verbose:
+            print(f"{stage.name}: {status[stage.name]}")
+
+    sources = pokedex_data.source_paths(data_dir)
+    if not pokedex_data.is_fresh(pokedex_data.read_manifest(cache_dir), sources):
+        names = list(pokedex_data.POKEDEX_COLUMNS) + ["types", "type_matrix"]
+        columns = pokedex_data.read_columns(cache_dir, names)
+        pokedex_data.write_manifest(cache_dir, {name: values.dtype for name, values in columns.items()}, sources)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    temporary = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        json.dump({"stages": stages}, file, indent=2)
+    os.replace(temporary, manifest_path)
+    return status
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", default=pokedex_data.DATA_DIR)
+    parser.add_argument("--force", action="store_true", help="rebuild every stage")
+    args = parser.parse_args()
+    build(args.data_dir, force=args.force)
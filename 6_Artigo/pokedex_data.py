@@ -0,0 +1,200 @@
+"""Data layer of 1_ga.py: reads the pokedex and the type chart CSVs without pandas
+and keeps a compiled binary copy of them, one .npy file per column, in data/.cache.
+
+The cache is keyed on the source files: it is reused while their mtime and size
+match the manifest, and when they don't the files are hashed, so a touched but
+unchanged CSV is not parsed again. The columns are memory mapped, every process
+loading them shares the same pages instead of parsing or pickling its own copy."""
+import csv
+import hashlib
+import json
+import os
+from collections import namedtuple
+import numpy as np
+
+basedir = os.path.abspath(os.path.dirname(__file__))
+DATA_DIR = os.path.join(basedir, "data")
+CACHE_FORMAT = 1 # bump when the cached columns change
+
+NO_TYPE = "NULL"
+NULL_VALUES = ("", NO_TYPE) # missing values of the CSVs, as pandas read them
+
+# column -> dtype of the cached pokedex, type1 and type2 are type codes
+POKEDEX_COLUMNS = {
+    "pokedex_number": np.int16,
+    "name": str,
+    "type1": np.int8,
+    "type2": np.int8,
+    "hp": np.int16,
+    "attack_total": np.int16,
+    "defense_total": np.int16,
+    "speed": np.int16,
+    "capture_rate": np.int16,
+    "legendary": bool,
+    "generation": np.int8,
+}
+
+Tables = namedtuple("Tables", ["pokedex", "types", "type_matrix"])
+Tables.__doc__ = """Loaded data: pokedex column arrays by name, type names (the code of a type is its position,
+the no type code is len(types)) and the float32 type_matrix[attacker, defender]."""
+
+def read_csv(path:str) -> tuple:
+    """Returns the header and the rows (lists of strings) of a CSV file."""
+    with open(path, newline="", encoding="utf-8") as file:
+        reader = csv.reader(file)
+        header = next(reader)
+        return header, [row for row in reader if row]
+
+def file_hash(path:str) -> str:
+    """Returns the sha256 of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def source_key(path:str, hashed:bool = True) -> dict:
+    """Returns the mtime, size and (if hashed) the sha256 of a source file."""
+    stat = os.stat(path)
+    key = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+    if hashed:
+        key["sha256"] = file_hash(path)
+    return key
+
+def is_fresh(manifest:dict, sources:dict) -> bool:
+    """Checks if the cache manifest was built from the sources (name -> path).
+    Files with the same mtime and size are trusted, the others are compared by hash."""
+    if manifest.get("format") != CACHE_FORMAT or set(manifest.get("sources", {})) != set(sources):
+        return False
+    for name, path in sources.items():
+        cached = manifest["sources"][name]
+        current = source_key(path, hashed=False)
+        if (current["mtime_ns"], current["size"]) == (cached["mtime_ns"], cached["size"]):
+            continue
+        if current["size"] != cached["size"] or file_hash(path) != cached["sha256"]:
+            return False
+    return True
+
+def read_manifest(cache_dir:str) -> dict:
+    """Returns the manifest of a cache directory, empty if there is none."""
+    try:
+        with open(os.path.join(cache_dir, "manifest.json"), encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def remove_manifest(cache_dir:str) -> None:
+    """Marks a cache directory as stale, done before any of its columns is rewritten."""
+    try:
+        os.remove(os.path.join(cache_dir, "manifest.json"))
+    except FileNotFoundError:
+        pass
+
+def write_column(cache_dir:str, name:str, values:np.ndarray) -> str:
+    """Writes one column as cache_dir/<name>.npy and returns its path.
+    The file is written to a temporary name and renamed, a reader never sees half a file."""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"{name}.npy")
+    temporary = os.path.join(cache_dir, f".{name}.{os.getpid()}.npy")
+    np.save(temporary, values, allow_pickle=False)
+    os.replace(temporary, path)
+    return path
+
+def write_manifest(cache_dir:str, dtypes:dict, sources:dict, **extra) -> None:
+    """Writes the manifest of the cached columns (name -> dtype) with the keys of their sources.
+    extra entries are stored in the manifest as they are."""
+    manifest = {
+        "format": CACHE_FORMAT,
+        "sources": {name: source_key(path) for name, path in sources.items()},
+        "columns": {name: str(dtype) for name, dtype in dtypes.items()},
+        **extra,
+    }
+    temporary = os.path.join(cache_dir, f".manifest.{os.getpid()}.json")
+    with open(temporary, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+    os.replace(temporary, os.path.join(cache_dir, "manifest.json"))
+
+def write_columns(cache_dir:str, columns:dict, sources:dict, **extra) -> None:
+    """Writes each column with write_column and then the manifest.
+    The old manifest goes first, an interrupted write leaves a stale cache and not a mixed one."""
+    remove_manifest(cache_dir)
+    for name, values in columns.items():
+        write_column(cache_dir, name, values)
+    write_manifest(cache_dir, {name: values.dtype for name, values in columns.items()}, sources, **extra)
+
+def read_columns(cache_dir:str, names, mmap:bool = True) -> dict:
+    """Returns the cached columns by name, memory mapped read only by default."""
+    mode = "r" if mmap else None
+    return {name: np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode=mode, allow_pickle=False) for name in names}
+
+def parse_type_chart(path:str) -> tuple:
+    """Returns the type names and the float32 type matrix of matriz_tipo.csv."""
+    header, rows = read_csv(path)
+    types = header[1:]
+    chart = {row[0]: row[1:] for row in rows}
+    if set(chart) != set(types):
+        raise ValueError(f"{path} rows and columns are not the same types")
+    matrix = np.array([chart[name] for name in types], dtype=np.float32)
+    return types, matrix
+
+def parse_pokedex(path:str, types:list) -> dict:
+    """Returns the pokedex columns of pokemon_dataset.csv as numpy arrays of POKEDEX_COLUMNS dtypes."""
+    header, rows = read_csv(path)
+    missing = set(POKEDEX_COLUMNS) - set(header)
+    if missing:
+        raise ValueError(f"{path} misses the columns {sorted(missing)}")
+    codes = {name: code for code, name in enumerate(types)}
+    codes.update((value, len(types)) for value in NULL_VALUES)
+
+    columns = {}
+    for name, dtype in POKEDEX_COLUMNS.items():
+        position = header.index(name)
+        values = [row[position] for row in rows]
+        if name in ("type1", "type2"):
+            unknown = set(values) - set(codes)
+            if unknown:
+                raise ValueError(f"{path} {name} has unknown types {sorted(unknown)}")
+            columns[name] = np.array([codes[value] for value in values], dtype=dtype)
+        elif dtype is bool:
+            columns[name] = np.array([value == "True" for value in values], dtype=bool)
+        elif dtype is str:
+            columns[name] = np.array(values, dtype=str)
+        else:
+            columns[name] = np.array(values, dtype=np.int64).astype(dtype)
+            if not np.array_equal(columns[name], np.array(values, dtype=np.int64)):
+                raise ValueError(f"{path} {name} does not fit in {np.dtype(dtype)}")
+    return columns
+
+def source_paths(data_dir:str = DATA_DIR) -> dict:
+    """Returns the CSVs the cache is built from, by source name."""
+    return {
+        "pokedex": os.path.join(data_dir, "pokemon_dataset.csv"),
+        "type_chart": os.path.join(data_dir, "matriz_tipo.csv"),
+    }
+
+def load(data_dir:str = DATA_DIR, cache_dir:str = None, rebuild:bool = False, mmap:bool = True) -> Tables:
+    """Returns the pokedex and type chart Tables, from the binary cache when it is fresh.
+    Otherwise the CSVs are parsed and the cache is written, or only kept in memory
+    if the cache directory is not writable."""
+    cache_dir = os.path.join(data_dir, ".cache") if cache_dir is None else cache_dir
+    sources = source_paths(data_dir)
+    names = list(POKEDEX_COLUMNS) + ["types", "type_matrix"]
+
+    manifest = read_manifest(cache_dir)
+    if not rebuild and is_fresh(manifest, sources):
+        try:
+            columns = read_columns(cache_dir, names, mmap)
+        except (OSError, ValueError):
+            pass
+        else:
+            types = columns.pop("types").tolist()
+            type_matrix = columns.pop("type_matrix")
+            return Tables(columns, types, type_matrix)
+
+    types, type_matrix = parse_type_chart(sources["type_chart"])
+    columns = parse_pokedex(sources["pokedex"], types)
+    try:
+        write_columns(cache_dir, {**columns, "types": np.array(types, dtype=str), "type_matrix": type_matrix}, sources)
+    except OSError:
+        pass # read only checkout, the parsed tables are still good
+    return Tables(columns, types, type_matrix)
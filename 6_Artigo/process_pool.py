@@ -0,0 +1,31 @@
+"""Process pools of 1_ga.py that work with any multiprocessing start method.
+
+1_ga.py is not importable by name (it starts with a digit and is loaded by path),
+so under spawn or forkserver a worker could not unpickle its functions or classes.
+Every worker first loads the file under the module name of the parent, then the
+tasks resolve their references to that module as usual."""
+import importlib.util
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+def load_module(name:str, path:str, initializer:str = None) -> None:
+    """Process pool initializer: loads the file at path as module name, unless the worker
+    already has it (forked from the parent, or the __main__ of a spawned worker),
+    then calls its function named initializer, if any."""
+    module = sys.modules.get(name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    if initializer is not None:
+        getattr(module, initializer)()
+
+def executor(module, workers:int, initializer:str = None, mp_context=None) -> ProcessPoolExecutor:
+    """Returns a ProcessPoolExecutor whose workers load module (by its name and file)
+    before running any task. initializer names a function of module run once per worker,
+    mp_context is the multiprocessing context of the pool, the default start method if None."""
+    return ProcessPoolExecutor(
+        workers, mp_context=mp_context,
+        initializer=load_module, initargs=(module.__name__, module.__file__, initializer),
+    )
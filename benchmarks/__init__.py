@@ -0,0 +1,16 @@
+"""
+Benchmark suite for the class engines.
+
+Fixed seed workloads for the Pokemon team GA (6_Artigo/1_ga.py), the
+Himmelblau GA (1_Genetic/GA.py), the PSO (3_SwarmInteligence) and the
+scheduler LearningPhase (5_Experiment), and their vectorized
+counterparts (the *_vectorized engines). Run it with:
+
+    python -m benchmarks --suite quick --output results.json
+    python -m benchmarks --suite quick --baseline baseline.json --threshold 0.1
+
+Each case runs in its own process and reports generations/sec,
+fitness evaluations/sec, peak RSS and the time spent in each phase
+(selection, crossover, mutation, evaluation). The exit code is 1 when
+the throughput of any case regresses more than the threshold.
+"""
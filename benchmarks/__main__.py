@@ -0,0 +1,82 @@
+"""
+Command line entry point: python -m benchmarks --help
+"""
+
+import argparse
+import itertools
+import json
+import sys
+
+from .runner import compare, metadata, run_isolated
+from .workloads import SUITES, WORKLOADS
+
+
+def parse_int_list(value:str) -> list:
+    return [int(x) for x in value.split(",") if x]
+
+
+def main(argv:list = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--suite", choices=sorted(SUITES), default="quick",
+                        help="(population, generations) grid to run")
+    parser.add_argument("--engines", default=",".join(WORKLOADS),
+                        help=f"comma separated engines, from {', '.join(WORKLOADS)}")
+    parser.add_argument("--populations", type=parse_int_list,
+                        help="comma separated populations, overrides the suite grid")
+    parser.add_argument("--generations", type=parse_int_list,
+                        help="comma separated generations, overrides the suite grid")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=300.0, help="seconds per case")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed relative drop of generations/sec before failing")
+    args = parser.parse_args(argv)
+
+    engines = [engine for engine in args.engines.split(",") if engine]
+    unknown = set(engines) - set(WORKLOADS)
+    if unknown:
+        parser.error(f"unknown engines {sorted(unknown)}")
+
+    if args.populations or args.generations:
+        populations = args.populations or sorted({p for p, _ in SUITES[args.suite]})
+        generations = args.generations or sorted({g for _, g in SUITES[args.suite]})
+        grid = list(itertools.product(populations, generations))
+    else:
+        grid = SUITES[args.suite]
+
+    results = []
+    for engine, (population, generation_count) in itertools.product(engines, grid):
+        case = run_isolated(engine, population, generation_count, args.seed, args.timeout)
+        results.append(case)
+        if case["status"] == "ok":
+            print(f"{engine:>14} pop={population:<7} gen={generation_count:<5} "
+                  f"{case['generations_per_sec']:10.2f} gen/s {case['evaluations_per_sec']:12.1f} eval/s "
+                  f"rss={case['peak_rss_mb'] or 0:8.1f}MB", flush=True)
+        else:
+            reason = case["reason"].strip().splitlines()[-1]
+            print(f"{engine:>14} pop={population:<7} gen={generation_count:<5} {case['status']}: {reason}", flush=True)
+
+    report = {"meta": metadata(args.suite), "results": results}
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        report["regressions"] = compare(results, baseline, args.threshold)
+        for regression in report["regressions"]:
+            print(f"REGRESSION {regression['engine']} pop={regression['population']} "
+                  f"gen={regression['generations']}: {regression['generations_per_sec']:.2f} gen/s "
+                  f"vs baseline {regression['baseline_generations_per_sec']:.2f} "
+                  f"({regression['ratio']:.0%})")
+        exit_code = 1 if report["regressions"] else 0
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
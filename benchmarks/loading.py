@@ -0,0 +1,66 @@
+"""
+Helpers to load the engines, which live in numbered folders and notebooks
+instead of importable packages.
+"""
+
+import importlib.util
+import json
+import os
+import re
+import sys
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+
+def load_module(relative_path:str, name:str):
+    """
+    Load a python file of the repository as a module.
+    The folder of the file is added to sys.path so its sibling imports work.
+
+    Parameters:
+        relative_path (str): Path of the file from the repository root.
+        name (str): Name given to the module in sys.modules.
+
+    Returns:
+        module: The loaded module.
+    """
+    path = os.path.join(REPO_DIR, relative_path)
+    folder = os.path.dirname(path)
+    if folder not in sys.path:
+        sys.path.insert(0, folder)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def notebook_namespace(relative_path:str, names:list, namespace:dict = None) -> dict:
+    """
+    Execute the code cells of a notebook that define the given functions or classes.
+    Only definition cells run, plotting and experiment cells are skipped.
+
+    Parameters:
+        relative_path (str): Path of the notebook from the repository root.
+        names (list): Function or class names to define.
+        namespace (dict): Initial namespace, usually the imports the cells need.
+
+    Returns:
+        dict: The namespace with the definitions.
+    """
+    with open(os.path.join(REPO_DIR, relative_path), encoding="utf-8") as f:
+        notebook = json.load(f)
+
+    pattern = re.compile(r"^(?:def|class)\s+(" + "|".join(map(re.escape, names)) + r")\b", re.MULTILINE)
+    namespace = {} if namespace is None else namespace
+    for cell in notebook["cells"]:
+        if cell["cell_type"] != "code":
+            continue
+        source = "".join(cell["source"])
+        if pattern.search(source):
+            exec(compile(source, relative_path, "exec"), namespace)
+
+    missing = [name for name in names if name not in namespace]
+    if missing:
+        raise LookupError(f"{relative_path} does not define {missing}")
+    return namespace
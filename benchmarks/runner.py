@@ -0,0 +1,137 @@
+"""
+Runs each benchmark case in its own process and compares results against a baseline.
+"""
+
+import multiprocessing
+import platform
+import sys
+import time
+import traceback
+
+import numpy as np
+
+from .workloads import WORKLOADS, PhaseTimer
+
+try:
+    import resource
+except ImportError: # windows
+    resource = None
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MB, None when unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(engine:str, population:int, generations:int, seed:int) -> dict:
+    """
+    Run one case in the current process.
+
+    Returns:
+        dict: The case metrics.
+    """
+    result = {"engine": engine, "population": population, "generations": generations, "seed": seed}
+    timer = PhaseTimer()
+    try:
+        run = WORKLOADS[engine](population, generations, seed, timer)
+    except ImportError as e:
+        return {**result, "status": "skipped", "reason": str(e)}
+
+    start = time.perf_counter()
+    evaluations = run()
+    seconds = time.perf_counter() - start
+
+    return {
+        **result,
+        "status": "ok",
+        "seconds": seconds,
+        "generations_per_sec": generations / seconds,
+        "evaluations": evaluations,
+        "evaluations_per_sec": evaluations / seconds,
+        "peak_rss_mb": peak_rss_mb(),
+        "phases": dict(timer.seconds),
+    }
+
+
+def _child(connection, engine, population, generations, seed):
+    try:
+        connection.send(run_case(engine, population, generations, seed))
+    except BaseException:
+        connection.send({"engine": engine, "population": population, "generations": generations,
+                         "seed": seed, "status": "error", "reason": traceback.format_exc()})
+    finally:
+        connection.close()
+
+
+def run_isolated(engine:str, population:int, generations:int, seed:int, timeout:float) -> dict:
+    """
+    Run one case in a fresh process, so peak RSS and imports do not leak between cases.
+
+    Returns:
+        dict: The case metrics, with status "timeout" when it exceeds timeout seconds.
+    """
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_child, args=(sender, engine, population, generations, seed))
+    process.start()
+    sender.close()
+    if receiver.poll(timeout):
+        result = receiver.recv()
+        process.join()
+    else:
+        process.terminate()
+        process.join()
+        result = {"engine": engine, "population": population, "generations": generations,
+                  "seed": seed, "status": "timeout", "reason": f"exceeded {timeout}s"}
+    receiver.close()
+    return result
+
+
+def metadata(suite:str) -> dict:
+    """Environment the results were measured on."""
+    return {
+        "suite": suite,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+    }
+
+
+def compare(results:list, baseline:list, threshold:float) -> list:
+    """
+    Compare the throughput of each case against the baseline.
+
+    Parameters:
+        results (list): Current case results.
+        baseline (list): Baseline case results.
+        threshold (float): Allowed relative drop of generations/sec, 0.1 = 10%.
+
+    Returns:
+        list: One dict per regressed case.
+    """
+    reference = {
+        (case["engine"], case["population"], case["generations"]): case
+        for case in baseline if case.get("status") == "ok"
+    }
+    regressions = []
+    for case in results:
+        base = reference.get((case["engine"], case["population"], case["generations"]))
+        if base is None or case["status"] != "ok":
+            continue
+        ratio = case["generations_per_sec"] / base["generations_per_sec"]
+        if ratio < 1 - threshold:
+            regressions.append({
+                "engine": case["engine"],
+                "population": case["population"],
+                "generations": case["generations"],
+                "baseline_generations_per_sec": base["generations_per_sec"],
+                "generations_per_sec": case["generations_per_sec"],
+                "ratio": ratio,
+            })
+    return regressions
@@ -0,0 +1,236 @@
+"""
+Fixed seed workloads for each engine.
+
+A workload receives (population, generations, seed, timer), does its setup
+(loading modules, building the engine, wrapping the phase methods in the
+timer) and returns a callable that runs the engine and returns the number
+of fitness evaluations it did. Only that callable is timed.
+"""
+
+import contextlib
+import functools
+import itertools
+import os
+import random
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from .loading import load_module, notebook_namespace
+
+
+class PhaseTimer:
+    """
+    Accumulates the time and the number of calls of wrapped methods by phase.
+    Phases may nest (e.g. an evaluation inside a selection), each one is timed on its own.
+    """
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.calls = defaultdict(int)
+
+    def patch(self, owner, name:str, phase:str) -> None:
+        """
+        Replace owner.name (an instance, class or namespace dict) by a timed wrapper.
+
+        Parameters:
+            owner: Object, class or dict holding the function.
+            name (str): Attribute or key of the function.
+            phase (str): Phase the time is added to.
+        """
+        original = owner[name] if isinstance(owner, dict) else getattr(owner, name)
+        seconds = self.seconds
+        calls = self.calls
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                seconds[phase] += time.perf_counter() - start
+                calls[phase] += 1
+
+        if isinstance(owner, dict):
+            owner[name] = timed
+        else:
+            setattr(owner, name, timed)
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the per generation prints of the engines."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def seed_all(seed:int) -> None:
+    """Seed the global generators used by the engines that have no seed argument."""
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def pokemon_ga(population:int, generations:int, seed:int, timer:PhaseTimer):
+    """GeneticAlgorithm of 6_Artigo/1_ga.py, one oponent team, mutation rate 0.1."""
+    module = load_module("6_Artigo/1_ga.py", "ga")
+    ga = module.GeneticAlgorithm(population_size=population, seed=seed)
+    timer.patch(ga, "roulette_wheel_selection_batch", "selection")
+    timer.patch(ga, "crossover", "crossover")
+    timer.patch(ga, "mutation", "mutation")
+    timer.patch(ga, "calculate_population_fitness", "evaluation")
+    timer.patch(ga, "score_children", "evaluation")
+
+    def run() -> int:
+        with quiet():
+            ga.run(max_generations=generations, mutation_rate=0.1)
+        return population * generations
+
+    return run
+
+
+def himmelblau_ga(population:int, generations:int, seed:int, timer:PhaseTimer):
+    """AlgoritmoGenetico of 1_Genetic/GA.py, mutation rate 0.1."""
+    module = load_module("1_Genetic/GA.py", "GA")
+    seed_all(seed)
+    timer.patch(module.AlgoritmoGenetico, "selecionar_individuo", "selection")
+    timer.patch(module.Individuo, "crossover_default", "crossover")
+    timer.patch(module.Individuo, "mutation", "mutation")
+    timer.patch(module.Individuo, "cal_fitness", "evaluation")
+    ag = module.AlgoritmoGenetico(population)
+
+    def run() -> int:
+        with quiet():
+            ag.inicializa_populacao()
+            ag.run_algoritmo(0.1, generations)
+        return timer.calls["evaluation"]
+
+    return run
+
+
+def himmelblau_vectorized(population:int, generations:int, seed:int, timer:PhaseTimer):
+    """AlgoritmoGeneticoVetorizado of 1_Genetic/GA.py, mutation rate 0.1."""
+    module = load_module("1_Genetic/GA.py", "GA")
+    ag = module.AlgoritmoGeneticoVetorizado(population, semente=seed, verbose=False)
+    timer.patch(ag, "selecionar_individuos", "selection")
+    timer.patch(ag, "crossover", "crossover")
+    timer.patch(ag, "mutacao", "mutation")
+    timer.patch(ag, "avaliar", "evaluation")
+
+    def run() -> int:
+        ag.inicializa_populacao()
+        ag.run_algoritmo(0.1, generations)
+        return population + sum(registro.avaliacoes for registro in ag.lista_solucoes)
+
+    return run
+
+
+def pso(population:int, generations:int, seed:int, timer:PhaseTimer):
+    """PSO of 3_SwarmInteligence/Swarm_Intelligence.ipynb, w=0.7, c1=c2=2."""
+    namespace = notebook_namespace(
+        "3_SwarmInteligence/Swarm_Intelligence.ipynb",
+        ["himmelblau", "Particle", "PSO"],
+        {"random": random, "np": np},
+    )
+    seed_all(seed)
+    timer.patch(namespace["PSO"], "update_particle_velocity", "velocity")
+    timer.patch(namespace["PSO"], "update_particle_position", "position")
+    timer.patch(namespace, "himmelblau", "evaluation")
+    swarm = namespace["PSO"](population, generations)
+
+    def run() -> int:
+        with quiet():
+            swarm.run_pso(0.7, 2.0, 2.0)
+        return timer.calls["evaluation"]
+
+    return run
+
+
+def pso_vectorized(population:int, generations:int, seed:int, timer:PhaseTimer):
+    """PSO of 3_SwarmInteligence/pso.py, w=0.7, c1=c2=2."""
+    module = load_module("3_SwarmInteligence/pso.py", "pso")
+    swarm = module.PSO(population, generations, seed=seed, verbose=False)
+    timer.patch(swarm, "update_velocities", "velocity")
+    timer.patch(swarm, "update_positions", "position")
+    timer.patch(swarm, "evaluate", "evaluation")
+
+    def run() -> int:
+        swarm.run_pso(0.7, 2.0, 2.0)
+        return population * timer.calls["evaluation"]
+
+    return run
+
+
+# task graph of the SchedulerExperiment notebook
+SCHEDULER_SUBSET_SIZES = (1, 4, 2, 1)
+SCHEDULER_EDGES = [(0, 1), (0, 2), (0, 3), (0, 4), (1, 5), (2, 5), (3, 6), (4, 6), (5, 7), (6, 7)]
+SCHEDULER_DURATIONS = {0: 5, 1: 2, 2: 2, 3: 2, 4: 2, 5: 4, 6: 3, 7: 7}
+
+
+def scheduler(population:int, generations:int, seed:int, timer:PhaseTimer):
+    """LearningPhase of 5_Experiment/SchedulerExperiment.ipynb on the notebook task graph."""
+    import networkx as nx
+
+    namespace = notebook_namespace(
+        "5_Experiment/SchedulerExperiment.ipynb",
+        ["multilayered_graph", "Task", "Processor", "Scheduler", "CellularAutomata", "LearningPhase"],
+        {"random": random, "itertools": itertools, "np": np, "nx": nx},
+    )
+    seed_all(seed)
+    graph = namespace["multilayered_graph"](*SCHEDULER_SUBSET_SIZES, edges=SCHEDULER_EDGES)
+    for node, duration in SCHEDULER_DURATIONS.items():
+        graph.nodes[node]["duration"] = duration
+
+    learning_phase = namespace["LearningPhase"]
+    timer.patch(learning_phase, "select_parents", "selection")
+    timer.patch(learning_phase, "crossover", "crossover")
+    timer.patch(learning_phase, "mutate", "mutation")
+    timer.patch(learning_phase, "evaluate_fitness", "evaluation")
+    lp = learning_phase(graph, population_size=population, max_generations=generations)
+
+    def run() -> int:
+        with quiet():
+            lp.run_genetic_algorithm()
+        return timer.calls["evaluation"]
+
+    return run
+
+
+def scheduler_vectorized(population:int, generations:int, seed:int, timer:PhaseTimer):
+    """LearningPhase of 5_Experiment/learning_phase.py on the notebook task graph."""
+    import networkx as nx
+
+    module = load_module("5_Experiment/learning_phase.py", "learning_phase")
+    graph = nx.DiGraph(SCHEDULER_EDGES)
+    for node, duration in SCHEDULER_DURATIONS.items():
+        graph.nodes[node]["duration"] = duration
+
+    lp = module.LearningPhase(graph, population_size=population, max_generations=generations,
+                              seed=seed, verbose=False)
+    timer.patch(lp, "select_parents", "selection")
+    timer.patch(lp, "crossover", "crossover")
+    timer.patch(lp, "mutate", "mutation")
+    timer.patch(lp, "evaluate_fitness", "evaluation")
+
+    def run() -> int:
+        lp.run_genetic_algorithm()
+        return lp.schedule.hits + lp.schedule.misses
+
+    return run
+
+
+WORKLOADS = {
+    "pokemon_ga": pokemon_ga,
+    "himmelblau_ga": himmelblau_ga,
+    "himmelblau_vectorized": himmelblau_vectorized,
+    "pso": pso,
+    "pso_vectorized": pso_vectorized,
+    "scheduler": scheduler,
+    "scheduler_vectorized": scheduler_vectorized,
+}
+
+# (population, generations) grids
+SUITES = {
+    "quick": [(20, 10), (200, 10), (20, 100)],
+    "full": [(20, 10), (20, 1000), (1_000, 100), (10_000, 10), (100_000, 10)],
+}
@@ -0,0 +1,5 @@
+"""Shared helpers of the tests: the engines live in numbered folders, loaded like the benchmarks do."""
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
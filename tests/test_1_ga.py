@@ -0,0 +1,97 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from benchmarks.loading import load_module
+
+
+@pytest.fixture(scope="module")
+def ga():
+    return load_module("6_Artigo/1_ga.py", "ga")
+
+
+@pytest.fixture(scope="module")
+def spawn():
+    return multiprocessing.get_context("spawn")
+
+
+def test_evaluate_teams_in_a_spawned_pool(ga, spawn):
+    serial = ga.GeneticAlgorithm(population_size=16, seed=3, verbose=False)
+    serial.initialize_oponent_team()
+    teams = np.random.default_rng(3).integers(0, len(ga.data.pokedex_store), size=(64, 6))
+
+    with ga.GeneticAlgorithm(population_size=16, seed=3, verbose=False, workers=2,
+                             parallel_threshold=1, mp_context=spawn) as parallel:
+        parallel.oponent_team = serial.oponent_team
+        np.testing.assert_array_equal(parallel.evaluate_teams(teams), serial.evaluate_teams(teams))
+
+
+def test_run_many_in_a_spawned_pool(ga, spawn):
+    configs = [
+        {"population_size": 12, "max_generations": 4, "mutation_rate": rate,
+         "stopping": ga.StoppingCriteria(stall_generations=10)}
+        for rate in (0.05, 0.2)
+    ]
+    serial = ga.run_many(configs, workers=1, seed=7)
+    parallel = ga.run_many(configs, workers=2, seed=7, mp_context=spawn)
+    assert [run["history"] for run in parallel] == [run["history"] for run in serial]
+    assert [run["best_team"] for run in parallel] == [run["best_team"] for run in serial]
+
+
+def test_children_use_the_team_cache(ga):
+    cached = ga.GeneticAlgorithm(population_size=100, seed=1, verbose=False, verify_delta=True)
+    cached.run(max_generations=30, mutation_rate=0.05)
+    stats = cached.cache_stats()["team"]
+    assert stats["hits"] > 0 and stats["size"] > cached.population_size
+
+    uncached = ga.GeneticAlgorithm(population_size=100, seed=1, verbose=False, cache_size=0)
+    uncached.run(max_generations=30, mutation_rate=0.05)
+    assert [record.fitness for record in cached.historical_fitness] == [record.fitness for record in uncached.historical_fitness]
+
+
+def test_pokedex_columns_are_not_copied(ga):
+    store, evaluator = ga.data.pokedex_store, ga.data.evaluator
+    assert store.hp is ga.data.tables.pokedex["hp"] and evaluator.hp is store.hp
+    assert store.hp.dtype == np.int16 and store.type1.dtype == np.int8
+
+    rows = np.arange(len(store))
+    wide = {name: ga.data.tables.pokedex[name].astype(float) for name in ("hp", "attack_total", "defense_total", "speed")}
+    pair_fitness = evaluator.pair_fitness(rows[:, None], rows[:6])
+    multiplier = evaluator.dual[store.type1[rows][:, None], store.type2[rows][:, None], store.type1[:6], store.type2[:6]]
+    expected = (wide["hp"][rows][:, None] / wide["hp"][:6]
+                + ((wide["attack_total"][rows][:, None] / wide["defense_total"][:6]) * multiplier)
+                * (wide["speed"][rows][:, None] / wide["speed"][:6]))
+    assert pair_fitness.dtype == np.float64
+    np.testing.assert_array_equal(pair_fitness[:, 0, :], expected)
+    assert type(ga.Individual(0).hp) is np.int64
+
+
+def test_league_contributions_respect_the_memory_budget(ga):
+    league = ga.data.pokedex_store.sample((40, 6), np.random.default_rng(5))
+    pair_matrix = ga.data.evaluator.pair_matrix()
+    table = ga.data.evaluator.slot_fitness(pair_matrix[:, league])
+
+    worst = ga.LeagueEvaluator(league, reduce="worst")
+    np.testing.assert_array_equal(worst.contributions, table)
+    with pytest.raises(ValueError):
+        ga.LeagueEvaluator(league, reduce="worst", memory_budget=table.nbytes - 1)
+
+    # one chunk sums like mean, small chunks only differ in the last bits
+    np.testing.assert_array_equal(ga.LeagueEvaluator(league).contributions, table.mean(axis=1))
+    chunked = ga.LeagueEvaluator(league, memory_budget=table.nbytes // 4)
+    np.testing.assert_allclose(chunked.contributions, table.mean(axis=1), rtol=1e-12)
+
+
+def test_batch_duplicates_are_not_cache_hits(ga):
+    algorithm = ga.GeneticAlgorithm(population_size=4, seed=2, verbose=False)
+    algorithm.initialize_oponent_team()
+    rows = [1, 2, 3, 4, 5, 6]
+    algorithm.population = [ga.TeamIndividual([ga.Individual(row) for row in rows]) for _ in range(3)]
+    algorithm.calculate_population_fitness()
+    stats = algorithm.cache_stats()
+    assert (stats["team"]["hits"], stats["team"]["misses"], stats["batch_duplicates"]) == (0, 1, 2)
+
+    # the cache owns its arrays, no view keeps the evaluated batch alive
+    _, fitness_list, contributions = algorithm.team_cache.get((tuple(rows), algorithm.oponent_key()))
+    assert fitness_list.base is None and contributions.base is None
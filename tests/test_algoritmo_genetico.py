@@ -0,0 +1,73 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from benchmarks.loading import load_module
+
+
+@pytest.fixture(scope="module")
+def ag():
+    return load_module("1_Genetic/exemples/algoritmo_genetico.py", "algoritmo_genetico")
+
+
+@pytest.fixture(scope="module")
+def exemplo(ag):
+    espacos = np.array([espaco for _, espaco, _ in ag.PRODUTOS_EXEMPLO])
+    valores = np.array([valor for _, _, valor in ag.PRODUTOS_EXEMPLO])
+    return espacos, valores, ag.LIMITE_EXEMPLO
+
+
+def valor(escolhidos, espacos, valores, limite):
+    assert espacos[escolhidos].sum() <= limite
+    return valores[escolhidos].sum()
+
+
+def test_escala_dp_usa_a_resolucao_dos_espacos(ag, exemplo):
+    espacos, _, limite = exemplo
+    # 0.0000899 pede 10^7, limitado por max_celulas a 10^6
+    assert ag.escala_dp(espacos, limite) == 10**6
+    assert ag.escala_dp(espacos, limite, max_celulas=10**7) == 10**5
+    assert ag.escala_dp([1, 2, 3], 10) == 1
+
+
+def test_semente_dp_nao_perde_para_gulosa(ag, exemplo):
+    espacos, valores, limite = exemplo
+    gulosa = valor(ag.solucao_gulosa(espacos, valores, limite), espacos, valores, limite)
+    dp = valor(ag.solucao_dp(espacos, valores, limite), espacos, valores, limite)
+    otimo = max(
+        valores[list(itens)].sum()
+        for quantidade in range(len(espacos) + 1)
+        for itens in itertools.combinations(range(len(espacos)), quantidade)
+        if espacos[list(itens)].sum() <= limite
+    )
+    assert dp >= gulosa
+    assert dp == pytest.approx(otimo)
+
+
+def test_resolver_repassa_escala_para_a_semente(ag, exemplo):
+    espacos, valores, limite = exemplo
+    gulosa = valor(ag.solucao_gulosa(espacos, valores, limite), espacos, valores, limite)
+    algoritmo = ag.AlgoritmoGeneticoBits(20, semente=0, verbose=False)
+    algoritmo.resolver(0.01, 0, espacos, valores, limite, semeadura="dp")
+    assert algoritmo.melhor_nota >= gulosa
+
+    # escala 1 arredonda os espaços fracionários para unidades inteiras e perde valor
+    algoritmo = ag.AlgoritmoGeneticoBits(20, semente=0, verbose=False)
+    algoritmo.resolver(0.01, 0, espacos, valores, limite, semeadura="dp", escala=1)
+    assert algoritmo.melhor_nota < gulosa
+
+
+@pytest.mark.parametrize("reparo", [None, "lamarckiano", "baldwiniano"])
+def test_cromossomo_devolvido_e_viavel_e_vale_a_melhor_nota(ag, reparo):
+    rng = np.random.default_rng(9)
+    espacos, valores = rng.uniform(0.1, 1.0, 2000), rng.uniform(1.0, 100.0, 2000)
+    limite = espacos.sum() / 4
+    algoritmo = ag.AlgoritmoGeneticoBits(40, semente = 3, verbose = False, reparo = reparo)
+    # sem reparo só a semente gulosa é viável, com reparo os cromossomos aleatórios (metade dos itens) excedem o limite
+    semeadura = "gulosa" if reparo is None else None
+    cromossomo = algoritmo.resolver(0.001, 20, espacos, valores, limite, semeadura = semeadura)
+    escolhidos = cromossomo.astype(bool)
+    assert espacos[escolhidos].sum() <= limite
+    assert valores[escolhidos].sum() == pytest.approx(algoritmo.melhor_nota, rel = 1e-12)
+    assert espacos[escolhidos].sum() == pytest.approx(algoritmo.melhor_espaco, rel = 1e-12)
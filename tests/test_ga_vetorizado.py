@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from benchmarks.loading import load_module
+
+
+@pytest.fixture(scope="module")
+def ga():
+    return load_module("1_Genetic/GA.py", "GA")
+
+
+def test_selecao_igual_a_busca_por_sorteio(ga):
+    algoritmo = ga.AlgoritmoGeneticoVetorizado(1000, semente=4, verbose=False)
+    algoritmo.inicializa_populacao()
+    estado = algoritmo.rng.bit_generator.state
+    indices = algoritmo.selecionar_individuos(5000)
+
+    algoritmo.rng.bit_generator.state = estado
+    sorteios = algoritmo.rng.random(5000) * algoritmo.probabilidade_acumulada[-1]
+    esperado = np.searchsorted(algoritmo.probabilidade_acumulada, sorteios, side="right")
+    np.testing.assert_array_equal(indices, np.minimum(esperado, 999))
@@ -0,0 +1,37 @@
+import random
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from benchmarks.loading import load_module
+
+
+@pytest.fixture(scope="module")
+def gfg():
+    return load_module("1_Genetic/exemples/GfG_GA_exemple.py", "GfG_GA_exemple")
+
+
+def test_defaults_scale_with_the_population(gfg):
+    small = gfg.VectorizedPopulation(population_size=100)
+    assert (small.parents, small.elite) == (50, 10)
+    large = gfg.VectorizedPopulation(population_size=1000)
+    assert (large.parents, large.elite) == (200, 50)
+
+
+def test_converges_on_a_long_target(gfg):
+    generator = random.Random(0)
+    target = "".join(generator.choice(gfg.GENES) for _ in range(1000))
+    population = gfg.VectorizedPopulation(target=target, population_size=1000, seed=1)
+    assert population.run(max_generations=5000, verbose=False) == target
+
+
+def test_initial_population_is_drawn_without_a_wide_copy(gfg):
+    tracemalloc.start()
+    population = gfg.VectorizedPopulation(target="a" * 1000, population_size=2000, chunk_genes=1 << 16, seed=0)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # two uint8 buffers of 2 MB, an int64 draw of the whole population alone would be 16 MB
+    assert peak < 2 * population.population.nbytes + (1 << 20)
+    assert population.population.dtype == np.uint8
+    assert np.isin(population.population, population.genes).all()
@@ -0,0 +1,62 @@
+import multiprocessing
+import os
+import signal
+import time
+
+import numpy as np
+import pytest
+
+from benchmarks.loading import load_module
+
+
+@pytest.fixture(scope="module")
+def pso():
+    return load_module("3_SwarmInteligence/pso.py", "pso")
+
+
+@pytest.mark.parametrize("quantity", [7, 12, 30, 100])
+def test_von_neumann_grid_has_exactly_n_cells(pso, quantity):
+    rows, columns = pso.grid_shape(quantity)
+    assert rows * columns == quantity and rows <= columns
+    neighbors = pso.von_neumann_neighbors(quantity)
+    assert (neighbors[:, 0] == np.arange(quantity)).all()
+    # every particle is the up, down, left and right neighbor of exactly one particle
+    for column in range(1, 5):
+        assert sorted(neighbors[:, column]) == list(range(quantity))
+
+
+@pytest.mark.parametrize("quantity, k", [(10, 2), (10, 9), (500, 4)])
+def test_random_informants_are_distinct_others(pso, quantity, k):
+    neighbors = pso.random_neighbors(quantity, k, np.random.default_rng(0))
+    assert neighbors.shape == (quantity, k + 1)
+    assert (neighbors[:, 0] == np.arange(quantity)).all()
+    assert all(len(set(row)) == k + 1 for row in neighbors.tolist())
+
+
+def test_random_informants_need_enough_particles(pso):
+    with pytest.raises(ValueError):
+        pso.random_neighbors(5, 5, np.random.default_rng(0))
+
+
+class KillFirstIsland:
+    """Objective that SIGKILLs the first island process to evaluate, like an OOM kill."""
+    def __init__(self, pso):
+        self.himmelblau = pso.himmelblau
+        self.killed = multiprocessing.Value("b", 0)
+
+    def __call__(self, positions):
+        with self.killed.get_lock():
+            kill = not self.killed.value
+            self.killed.value = 1
+        if kill:
+            os.kill(os.getpid(), signal.SIGKILL)
+        return self.himmelblau(positions)
+
+
+def test_run_islands_fails_when_an_island_is_killed(pso):
+    start = time.perf_counter()
+    with pytest.raises(RuntimeError, match="islands failed"):
+        pso.run_islands(3, 10, 40, migration_interval=5, seed=1, barrier_timeout=120,
+                        objective=KillFirstIsland(pso))
+    # the survivors are released by the aborted barrier, not by its timeout
+    assert time.perf_counter() - start < 60